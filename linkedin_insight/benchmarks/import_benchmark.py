@@ -0,0 +1,54 @@
+import argparse
+import os
+import subprocess
+import sys
+
+# Checks the import cost of the offline --json path with `python -X importtime`.
+# The path must not load the browser stack, the HTML parsers or the renderers,
+# and the project modules it imports must load within the time budget; either
+# failure exits with status 1.
+
+JSON_PATH_IMPORTS = "import src.main, src.data_processing.json_processor"
+FORBIDDEN_MODULES = ['selenium', 'webdriver_manager', 'bs4', 'lxml', 'graphviz', 'jinja2']
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def import_times(statement):
+    # Each stderr line is "import time: self [us] | cumulative | <indent>module"
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement], cwd=PROJECT_ROOT,
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True, check=True)
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, module = line[len('import time:'):].split('|')
+        depth = (len(module) - len(module.lstrip())) // 2
+        entries.append((module.strip(), int(self_us), int(cumulative_us), depth))
+    return entries
+
+def check(budget_ms, top):
+    entries = import_times(JSON_PATH_IMPORTS)
+    total_ms = sum(cumulative for module, _, cumulative, depth in entries
+                   if depth == 0 and (module == 'src' or module.startswith('src.'))) / 1000
+    forbidden = sorted({module for module, _, _, _ in entries if module.split('.')[0] in FORBIDDEN_MODULES})
+
+    print(f"--json path imports: {total_ms:.1f}ms (budget {budget_ms:.0f}ms)")
+    for module, self_us, _, _ in sorted(entries, key=lambda entry: entry[1], reverse=True)[:top]:
+        print(f"  {self_us / 1000:>7.1f}ms  {module}")
+
+    failures = []
+    if forbidden:
+        failures.append(f"heavy modules loaded: {', '.join(forbidden)}")
+    if total_ms > budget_ms:
+        failures.append(f"{total_ms:.1f}ms is over the {budget_ms:.0f}ms budget")
+    return failures
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check the import time of the offline --json path")
+    parser.add_argument("--budget-ms", type=float, default=250, help="Maximum import time of the project modules in milliseconds (default: 250)")
+    parser.add_argument("--top", type=int, default=10, help="Number of slowest modules to list (default: 10)")
+    args = parser.parse_args()
+    failures = check(args.budget_ms, args.top)
+    if failures:
+        for failure in failures:
+            print(f"FAILED: {failure}")
+        sys.exit(1)
@@ -0,0 +1,65 @@
+import argparse
+import json
+import os
+import random
+import tempfile
+import tracemalloc
+from src.data_processing.employee_record import EmployeeTable
+from src.data_processing.jsonl_stream import EmployeeStream, write_company_network
+from .synthetic import TITLES
+
+# Compares the memory held by employees loaded from a JSON Lines snapshot as
+# plain dicts, as a list of Employee records and as an EmployeeTable. Photo
+# URLs carry a signed token like the real ones, so the URL part of each record
+# is realistic.
+
+LOCATIONS = ["Milan, Italy", "Rome, Italy", "London, United Kingdom", "Berlin, Germany", "Remote"]
+
+def synthetic_employees(count, seed=0):
+    rng = random.Random(seed)
+    for i in range(count):
+        token = ''.join(rng.choice('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789') for _ in range(43))
+        yield {
+            "name": f"Person {i}",
+            "title": rng.choice(TITLES),
+            "location": rng.choice(LOCATIONS),
+            "profile_url": f"https://www.linkedin.com/in/person-{i}",
+            "photo_url": f"https://media.licdn.com/dms/image/v2/D4E03AQ{token[:12]}/profile-displayphoto-shrink_100_100/0/1700000000000?e=1735776000&v=beta&t={token}"
+        }
+
+def measure(load):
+    tracemalloc.start()
+    employees = load()
+    # Keeps the result alive until the measurement, whatever load returns
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, len(employees)
+
+def load_dicts(path):
+    employees = []
+    with open(path, 'rb') as f:
+        for line in f:
+            record = json.loads(line)
+            if record['type'] == 'employee':
+                employees.append(record['data'])
+    return employees
+
+def run(sizes):
+    print(f"{'employees':>10} {'dicts':>7} {'records':>8} {'saving':>7} {'table':>7} {'saving':>7}   (bytes per employee)")
+    with tempfile.TemporaryDirectory(prefix="memory_benchmark_") as work_dir:
+        for size in sizes:
+            path = os.path.join(work_dir, f"company_{size}_linkedin_data.jsonl")
+            write_company_network({'company': {'name': 'Acme'}, 'employees': synthetic_employees(size)}, path)
+            dict_bytes, count = measure(lambda: load_dicts(path))
+            record_bytes, record_count = measure(lambda: list(EmployeeStream(path)))
+            table_bytes, table_count = measure(lambda: EmployeeTable(EmployeeStream(path)))
+            if not count == record_count == table_count:
+                raise SystemExit(f"Loaded {count} dicts, {record_count} records and {table_count} table rows")
+            print(f"{size:>10} {dict_bytes / size:>7.0f} {record_bytes / size:>8.0f} {dict_bytes / record_bytes:>6.1f}x"
+                  f" {table_bytes / size:>7.0f} {dict_bytes / table_bytes:>6.1f}x")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the memory used by employee dicts, Employee records and an EmployeeTable")
+    parser.add_argument("--sizes", type=int, nargs='+', default=[10000, 100000], help="Employees per snapshot (default: 10000 100000)")
+    args = parser.parse_args()
+    run(args.sizes)
@@ -0,0 +1,72 @@
+import argparse
+import time
+from urllib.parse import urljoin
+from bs4 import BeautifulSoup
+from src.scraper.html_parser import parse_employees, parse_job_descriptions
+from .synthetic import synthetic_people_page, synthetic_jobs_page
+
+# Reference implementation of the original BeautifulSoup card parser.
+def soup_parse_employees(page_source):
+    employees = []
+    soup = BeautifulSoup(page_source, "lxml")
+    for card in soup.find_all("div", {"class": "org-people-profile-card__profile-info"}):
+        name_tag = card.find("div", {"class": "org-people-profile-card__profile-title"})
+        title_tag = card.find("div", {"class": "lt-line-clamp--multi-line"})
+        profile_tag = card.find("a", {"class": "app-aware-link"})
+        img_tag = card.find("img", {"src": True})
+        employee = {
+            "name": name_tag.get_text(strip=True) if name_tag else None,
+            "title": title_tag.get_text(strip=True) if title_tag else None,
+            "profile_url": urljoin("https://www.linkedin.com", profile_tag['href']) if profile_tag and 'href' in profile_tag.attrs else None,
+            "photo_url": img_tag['src'] if img_tag and 'src' in img_tag.attrs else None,
+        }
+        if employee["name"] or employee["title"] or employee["profile_url"]:
+            employees.append(employee)
+    return employees
+
+def soup_parse_job_descriptions(page_source):
+    job_descriptions = []
+    soup = BeautifulSoup(page_source, "lxml")
+    for card in soup.find_all("li", {"class": "result-card job-result-card"}):
+        title_tag = card.find("h3", {"class": "base-search-card__title"})
+        company_tag = card.find("a", {"class": "hidden-nested-link"})
+        location_tag = card.find("span", {"class": "job-search-card__location"})
+        job = {
+            "title": title_tag.get_text(strip=True) if title_tag else None,
+            "company": company_tag.get_text(strip=True) if company_tag else None,
+            "location": location_tag.get_text(strip=True) if location_tag else None,
+        }
+        if job["title"] or job["location"]:
+            job_descriptions.append(job)
+    return job_descriptions
+
+def best_time(func, page_source, repeat):
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(page_source)
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+def run(sizes, repeat):
+    cases = [
+        ("employees", synthetic_people_page, soup_parse_employees, parse_employees),
+        ("jobs", synthetic_jobs_page, soup_parse_job_descriptions, parse_job_descriptions),
+    ]
+    print(f"{'page':<10} {'cards':>8} {'soup (s)':>10} {'compiled (s)':>13} {'speedup':>8}")
+    for size in sizes:
+        for label, generator, reference, compiled in cases:
+            page_source = generator(size)
+            soup_time, expected = best_time(reference, page_source, repeat)
+            compiled_time, actual = best_time(compiled, page_source, repeat)
+            if actual != expected:
+                raise SystemExit(f"Parser output mismatch for {label} page with {size} cards")
+            print(f"{label:<10} {size:>8} {soup_time:>10.3f} {compiled_time:>13.3f} {soup_time / compiled_time:>7.1f}x")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the compiled card parser against BeautifulSoup")
+    parser.add_argument("--sizes", type=int, nargs='+', default=[100, 1000, 5000], help="Number of cards per synthetic page")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best time is reported)")
+    args = parser.parse_args()
+    run(args.sizes, args.repeat)
@@ -0,0 +1,161 @@
+import argparse
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from .synthetic import COMPANY_URL, synthetic_company_network, write_fixture_dir
+
+# End-to-end benchmark of the scraping and output stages on synthetic
+# companies. The scraper runs against the fixture driver, photos come from a
+# local image server, and the timings are written as JSON. Given a baseline
+# results file, stages slower than the baseline by more than the tolerance
+# make the run exit with status 1, so it can gate a build.
+
+STAGES = ['extract_employees', 'linkedin_scraper', 'write_employees_to_csv', 'create_hierarchy_pyramid', 'create_html_pyramid']
+PHOTO = b'\xff\xd8\xff\xe0' + bytes(2044)
+
+class PhotoHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'image/jpeg')
+        self.send_header('Content-Length', str(len(PHOTO)))
+        self.end_headers()
+        self.wfile.write(PHOTO)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_image_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), PhotoHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/photos"
+
+def import_stages():
+    from src.scraper import linkedin_scraper
+    from src.scraper.fixture_driver import FixtureDriver
+    from src.data_processing.csv_generator import write_employees_to_csv
+    from src.visualization.hierarchy_pyramid import create_hierarchy_pyramid, graphviz_available
+    from src.visualization.html_generator import create_html_pyramid
+    from src.utils.config import DelayConfig
+    return {
+        'delay_config': DelayConfig(enabled=False, scroll_idle_timeout=0),
+        'FixtureDriver': FixtureDriver,
+        'extract_employees': linkedin_scraper.extract_employees,
+        'linkedin_scraper': linkedin_scraper.linkedin_scraper,
+        'write_employees_to_csv': write_employees_to_csv,
+        'create_hierarchy_pyramid': create_hierarchy_pyramid,
+        'graphviz_available': graphviz_available,
+        'create_html_pyramid': create_html_pyramid
+    }
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return round(time.perf_counter() - start, 6), result
+
+def run_size(stages, size, work_dir, photo_base, scrape_limit):
+    fixture_dir = write_fixture_dir(os.path.join(work_dir, 'fixtures'), size, photo_base=photo_base)
+    output_dir = os.path.join(work_dir, 'output')
+    os.makedirs(output_dir)
+    timings = {}
+
+    driver = stages['FixtureDriver'](fixture_dir)
+    timings['extract_employees'], employees = timed(stages['extract_employees'], driver, COMPANY_URL, output_dir, max_cards=size,
+                                                   delay_config=stages['delay_config'])
+    if len(employees) != size:
+        raise SystemExit(f"Expected {size} employees from the synthetic people page, got {len(employees)}")
+
+    if size <= scrape_limit:
+        scrape_dir = os.path.join(work_dir, 'scrape')
+        os.makedirs(scrape_dir)
+        timings['linkedin_scraper'], _ = timed(
+            stages['linkedin_scraper'], COMPANY_URL, scrape_dir, driver=stages['FixtureDriver'](fixture_dir), max_employees=size, max_jobs=size,
+            delay_config=stages['delay_config']
+        )
+    else:
+        timings['linkedin_scraper'] = None
+
+    company_network = synthetic_company_network(size, photo_base=photo_base)
+    timings['write_employees_to_csv'], _ = timed(stages['write_employees_to_csv'], company_network['employees'], output_dir)
+    if stages['graphviz_available']():
+        timings['create_hierarchy_pyramid'], _ = timed(stages['create_hierarchy_pyramid'], company_network['employees'], 'Acme', output_dir)
+    else:
+        timings['create_hierarchy_pyramid'] = None
+    timings['create_html_pyramid'], _ = timed(stages['create_html_pyramid'], company_network, output_dir)
+    return timings
+
+def check_budget(results, baseline, tolerance, min_seconds):
+    regressions = []
+    for size, timings in results['sizes'].items():
+        for stage, seconds in timings.items():
+            expected = baseline.get('sizes', {}).get(size, {}).get(stage)
+            if seconds is None or expected is None:
+                continue
+            if seconds > max(expected * tolerance, min_seconds):
+                regressions.append(f"{stage} with {size} employees: {seconds:.3f}s, baseline {expected:.3f}s")
+    return regressions
+
+def run(sizes, output, scrape_limit, keep_dir=None):
+    from src.utils.logger import span_recorder
+
+    stages = import_stages()
+    server, photo_base = start_image_server()
+    results = {
+        'started_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'sizes': {}
+    }
+    print(f"{'employees':>10} " + ' '.join(f"{stage:>24}" for stage in STAGES))
+    try:
+        for size in sizes:
+            with tempfile.TemporaryDirectory(prefix=f"benchmark_{size}_", dir=keep_dir) as work_dir:
+                timings = run_size(stages, size, work_dir, photo_base, scrape_limit)
+            results['sizes'][str(size)] = timings
+            print(f"{size:>10} " + ' '.join(f"{'-' if timings[stage] is None else f'{timings[stage]:.3f}':>24}" for stage in STAGES))
+    finally:
+        server.shutdown()
+
+    results['spans'] = span_recorder.summary()
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=4)
+    print(f"Results saved in {output}")
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the scraping and output stages on synthetic companies")
+    parser.add_argument("--sizes", type=int, nargs='+', default=[10, 100, 1000, 10000], help="Employees per synthetic company (default: 10 100 1000 10000)")
+    parser.add_argument("--scrape-limit", type=int, default=1000, help="Largest size for which the full scraper, profile visits included, is run (default: 1000)")
+    parser.add_argument("--output", type=str, default="benchmark_results.json", help="Where to write the results (default: benchmark_results.json)")
+    parser.add_argument("--baseline", type=str, help="Results file to compare against; regressions exit with status 1")
+    parser.add_argument("--tolerance", type=float, default=1.25, help="Allowed slowdown relative to the baseline (default: 1.25)")
+    parser.add_argument("--min-seconds", type=float, default=0.05, help="Stages faster than this never count as regressions (default: 0.05)")
+    parser.add_argument("--work-dir", type=str, help="Parent directory for the temporary fixtures and output (default: system temp)")
+    parser.add_argument("--verbose", action='store_true', help="Keep the scraper's info logging on the console")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    if not args.verbose:
+        from src.utils.logger import setup_logger
+        setup_logger().setLevel(logging.WARNING)
+
+    results = run(args.sizes, args.output, args.scrape_limit, args.work_dir)
+    if baseline is not None:
+        regressions = check_budget(results, baseline, args.tolerance, args.min_seconds)
+        if regressions:
+            print("Regressions against the baseline:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print(f"No stage slower than {args.tolerance}x the baseline")
@@ -0,0 +1,114 @@
+import json
+import os
+import random
+
+# Synthetic LinkedIn pages and company data for the benchmarks. The pages use
+# the same markup as the real people, jobs and company pages, so they can be
+# parsed directly or served to the scraper through the fixture driver.
+
+TITLES = ['Chief Executive Officer', 'CTO', 'Vice President Sales', 'Director of Engineering',
+          'Engineering Manager', 'Senior Software Engineer', 'Associate Consultant', 'Software Engineer', 'Intern']
+
+PHOTO_BASE = "https://media.licdn.com/dms/image"
+COMPANY_URL = "https://www.linkedin.com/company/acme/"
+
+def synthetic_people_page(count, seed=0, photo_base=PHOTO_BASE):
+    rng = random.Random(seed)
+    cards = []
+    for i in range(count):
+        cards.append(f'''
+        <li class="grid grid__col--lg-8 org-people-profile-card__card-spacing">
+          <section class="artdeco-card full-width">
+            <div class="org-people-profile-card__profile-info">
+              <div class="artdeco-entity-lockup artdeco-entity-lockup--stacked-center">
+                <div class="artdeco-entity-lockup__image">
+                  <a class="app-aware-link" href="/in/person-{i}?miniProfileUrn=urn%3Ali%3Afs_miniProfile%3A{i}">
+                    <img class="evi-image lazy-image ember-view" src="{photo_base}/{i}/profile.jpg" alt="Person {i}">
+                  </a>
+                </div>
+                <div class="artdeco-entity-lockup__content">
+                  <div class="artdeco-entity-lockup__title">
+                    <a class="app-aware-link link-without-visited-state" href="/in/person-{i}">
+                      <div class="org-people-profile-card__profile-title t-black lt-line-clamp lt-line-clamp--single-line"> Person {i} </div>
+                    </a>
+                  </div>
+                  <div class="artdeco-entity-lockup__subtitle">
+                    <div class="lt-line-clamp lt-line-clamp--multi-line"> {rng.choice(TITLES)} </div>
+                  </div>
+                </div>
+              </div>
+            </div>
+          </section>
+        </li>''')
+    return f"<html><head><title>People</title></head><body><main><ul>{''.join(cards)}</ul></main></body></html>"
+
+def synthetic_jobs_page(count, seed=0):
+    rng = random.Random(seed)
+    cards = []
+    for i in range(count):
+        cards.append(f'''
+        <li class="result-card job-result-card">
+          <div class="base-search-card__info">
+            <h3 class="base-search-card__title"> {rng.choice(TITLES)} </h3>
+            <h4 class="base-search-card__subtitle"><a class="hidden-nested-link" href="/company/acme">Acme</a></h4>
+            <div class="base-search-card__metadata"><span class="job-search-card__location"> City {i % 50} </span></div>
+          </div>
+        </li>''')
+    return f"<html><body><ul class=\"jobs-search__results-list\">{''.join(cards)}</ul></body></html>"
+
+def synthetic_company_page(name="Acme"):
+    return ('<html><body><div class="org-top-card-primary-content__logo-container"><img src="logo.png"></div>'
+            '<ul class="org-top-card-summary-info-list"></ul>'
+            f'<h1 class="org-top-card-summary__title">{name}</h1>'
+            '<p class="org-top-card-summary__tagline">Synthetic company</p></body></html>')
+
+def synthetic_profile_page(seed=0):
+    rng = random.Random(seed)
+    return ('<html><body><main>'
+            f'<span class="text-body-small inline t-black--light break-words">City {seed % 50}</span>'
+            '<section><div id="experience"></div><ul><li class="artdeco-list__item">'
+            f'<span aria-hidden="true">{rng.choice(TITLES)}</span><span aria-hidden="true">Acme</span></li></ul></section>'
+            '</main></body></html>')
+
+def synthetic_company_network(employee_count, job_count=None, seed=0, photo_base=PHOTO_BASE, name="Acme"):
+    rng = random.Random(seed)
+    job_count = employee_count // 10 if job_count is None else job_count
+    return {
+        "company": {"name": name, "description": "Synthetic company", "logo_url": None},
+        "employees": [
+            {
+                "name": f"Person {i}",
+                "title": rng.choice(TITLES),
+                "profile_url": f"https://www.linkedin.com/in/person-{i}",
+                "photo_url": f"{photo_base}/{i}/profile.jpg"
+            }
+            for i in range(employee_count)
+        ],
+        "job_descriptions": [
+            {"title": rng.choice(TITLES), "company": name, "location": f"City {i % 50}"}
+            for i in range(job_count)
+        ],
+        "scraped_at": "2026-01-01T00:00:00"
+    }
+
+def write_fixture_dir(fixture_dir, employee_count, job_count=None, seed=0, photo_base=PHOTO_BASE):
+    # Lays the pages out the way FixtureDriver expects them; profile.html is
+    # served for every profile URL
+    job_count = employee_count // 10 if job_count is None else job_count
+    os.makedirs(fixture_dir, exist_ok=True)
+    pages = {
+        'company.html': synthetic_company_page(),
+        'people.html': synthetic_people_page(employee_count, seed, photo_base),
+        'jobs.html': synthetic_jobs_page(job_count, seed),
+        'profile.html': synthetic_profile_page(seed),
+        'feed.html': '<html><body><nav id="global-nav"></nav></body></html>'
+    }
+    for filename, html in pages.items():
+        with open(os.path.join(fixture_dir, filename), 'w', encoding='utf-8') as f:
+            f.write(html)
+    return fixture_dir
+
+def write_company_network(path, employee_count, job_count=None, seed=0, photo_base=PHOTO_BASE):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(synthetic_company_network(employee_count, job_count, seed, photo_base), f, ensure_ascii=False)
+    return path
@@ -3,7 +3,14 @@ from setuptools import setup, find_packages
 setup(
     name="linkedin_insight",
     version="0.1",
-    packages=find_packages(),
+    packages=find_packages(exclude=["benchmarks", "benchmarks.*"]),
+    package_data={
+        "src.visualization": ["templates/*.html"],
+    },
+    extras_require={
+        "thumbnails": ["Pillow"],
+        "export": ["pyarrow"],
+    },
     install_requires=[
         "selenium",
         "beautifulsoup4",
@@ -29,5 +36,5 @@ setup(
         "License :: OSI Approved :: MIT License",
         "Operating System :: OS Independent",
     ],
-    python_requires='>=3.6',
+    python_requires='>=3.8',
 )
\ No newline at end of file
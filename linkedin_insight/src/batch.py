@@ -0,0 +1,192 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from .scraper.driver_pool import DriverPool
+from .scraper.web_driver import driver_factory
+from .data_processing.snapshot_store import open_snapshot_store
+from .utils.config import SNAPSHOT_DB_PATH, CACHE_MAX_AGE, BATCH_MAX_ATTEMPTS
+from .utils.logger import setup_logger
+
+logger = setup_logger()
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS batch_jobs (
+    batch TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    slug TEXT NOT NULL,
+    company_url TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    started_at REAL,
+    finished_at REAL,
+    duration REAL,
+    output_dir TEXT,
+    error TEXT,
+    PRIMARY KEY (batch, slug)
+);
+CREATE INDEX IF NOT EXISTS batch_jobs_status ON batch_jobs (batch, status, position);
+'''
+
+def read_batch_file(batch_file, parse_company_input):
+    companies = []
+    seen = set()
+    with open(batch_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            company_input = line.strip()
+            if not company_input or company_input.startswith('#'):
+                continue
+            company_url, company_name = parse_company_input(company_input)
+            if not company_name:
+                logger.warning(f"Skipping invalid company entry: {company_input}")
+                continue
+            if company_name in seen:
+                continue
+            seen.add(company_name)
+            companies.append((company_name, company_url))
+    return companies
+
+def run_batch(batch_file, args, delay_config, scrape_company, parse_company_input, image_cache=None):
+    if not os.path.isfile(batch_file):
+        print(f"Specified batch file does not exist: {batch_file}")
+        logger.error(f"Specified batch file does not exist: {batch_file}")
+        return None
+
+    companies = read_batch_file(batch_file, parse_company_input)
+    batch_queue = BatchQueue(os.path.abspath(batch_file))
+    batch_queue.enqueue(companies)
+    # The pool holds --browsers browsers, and companies beyond that wait for a free one
+    workers = max(1, args.batch_workers or args.browsers)
+    pool = DriverPool(size=args.browsers, profile_root=args.browser_profile_dir, driver_factory=driver_factory(args.lean, args.headed), delay_config=delay_config)
+    started = time.time()
+    logger.info(f"Batch {batch_file}: {len(companies)} companies, {batch_queue.pending_count()} pending, {workers} workers, {pool.size} browsers")
+
+    def worker():
+        while True:
+            job = batch_queue.claim()
+            if job is None:
+                return
+            run_job(job, batch_queue, args, pool, delay_config, scrape_company, image_cache)
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for future in [executor.submit(worker) for _ in range(workers)]:
+                future.result()
+    finally:
+        pool.close()
+
+    report_path = args.batch_report or f"{os.path.splitext(batch_file)[0]}_report.json"
+    write_report(batch_queue, report_path, time.time() - started)
+    return report_path
+
+def run_job(job, batch_queue, args, pool, delay_config, scrape_company, image_cache=None):
+    slug, company_url = job['slug'], job['company_url']
+    started = time.time()
+    try:
+        snapshot = open_snapshot_store().latest_snapshot(slug, max_age=CACHE_MAX_AGE, with_data=True)
+        if snapshot and not args.force:
+            logger.info(f"Batch: {slug} has a fresh snapshot in {snapshot['directory']}, skipping")
+            batch_queue.finish(slug, 'fresh', time.time() - started, output_dir=snapshot['directory'])
+            return
+        logger.info(f"Batch: scraping {slug} (attempt {job['attempts']})")
+        output_dir = scrape_company(company_url, slug, args, pool, delay_config, image_cache)
+        if output_dir:
+            batch_queue.finish(slug, 'done', time.time() - started, output_dir=output_dir)
+        else:
+            batch_queue.finish(slug, 'failed', time.time() - started, error="Scraping failed")
+    except Exception as e:
+        logger.error(f"Batch: {slug} failed: {str(e)}")
+        batch_queue.finish(slug, 'failed', time.time() - started, error=str(e))
+
+def write_report(batch_queue, report_path, elapsed):
+    jobs = batch_queue.jobs()
+    summary = {}
+    for job in jobs:
+        summary[job['status']] = summary.get(job['status'], 0) + 1
+    report = {
+        'batch': batch_queue.batch,
+        'finished_at': datetime.now().isoformat(timespec='seconds'),
+        'elapsed': round(elapsed, 3),
+        'summary': summary,
+        'companies': jobs
+    }
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=4)
+    print(f"Batch report saved in {report_path}: {summary}")
+    logger.info(f"Batch report saved in {report_path}: {summary}")
+
+# Durable work queue for one batch file, kept next to the snapshot index. Jobs
+# left 'running' by a crash go back to 'pending' when the batch is reopened.
+# Failed jobs go back to the end of the queue, in the same run or the next one,
+# until they reach BATCH_MAX_ATTEMPTS. Once every job has settled, reopening
+# the file starts a new run.
+class BatchQueue:
+    def __init__(self, batch, path=SNAPSHOT_DB_PATH, max_attempts=BATCH_MAX_ATTEMPTS):
+        self.batch = batch
+        self.max_attempts = max_attempts
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.db.executescript(SCHEMA)
+        with self.db:
+            self.db.execute("UPDATE batch_jobs SET status = 'pending' WHERE batch = ? AND status = 'running'", (batch,))
+            self.db.execute(
+                "UPDATE batch_jobs SET status = 'pending' WHERE batch = ? AND status = 'failed' AND attempts < ?",
+                (batch, max_attempts)
+            )
+            pending = self.db.execute("SELECT COUNT(*) FROM batch_jobs WHERE batch = ? AND status = 'pending'", (batch,)).fetchone()[0]
+            if not pending:
+                # The previous run finished, so this is a fresh run of the same file
+                self.db.execute('DELETE FROM batch_jobs WHERE batch = ?', (batch,))
+
+    def enqueue(self, companies):
+        with self.lock, self.db:
+            self.db.executemany(
+                'INSERT OR IGNORE INTO batch_jobs (batch, position, slug, company_url) VALUES (?, ?, ?, ?)',
+                [(self.batch, position, slug, url) for position, (slug, url) in enumerate(companies)]
+            )
+
+    def pending_count(self):
+        with self.lock:
+            return self.db.execute(
+                "SELECT COUNT(*) FROM batch_jobs WHERE batch = ? AND status = 'pending'", (self.batch,)
+            ).fetchone()[0]
+
+    def claim(self):
+        with self.lock, self.db:
+            row = self.db.execute(
+                "SELECT slug, company_url, attempts FROM batch_jobs WHERE batch = ? AND status = 'pending' ORDER BY attempts, position LIMIT 1",
+                (self.batch,)
+            ).fetchone()
+            if row is None:
+                return None
+            self.db.execute(
+                "UPDATE batch_jobs SET status = 'running', attempts = attempts + 1, started_at = ? WHERE batch = ? AND slug = ?",
+                (time.time(), self.batch, row[0])
+            )
+        return {'slug': row[0], 'company_url': row[1], 'attempts': row[2] + 1}
+
+    def finish(self, slug, status, duration, output_dir=None, error=None):
+        with self.lock, self.db:
+            if status == 'failed':
+                attempts = self.db.execute('SELECT attempts FROM batch_jobs WHERE batch = ? AND slug = ?', (self.batch, slug)).fetchone()[0]
+                if attempts < self.max_attempts:
+                    logger.info(f"Batch: {slug} will be retried (attempt {attempts} of {self.max_attempts} failed)")
+                    status = 'pending'
+            self.db.execute(
+                'UPDATE batch_jobs SET status = ?, finished_at = ?, duration = ?, output_dir = ?, error = ? WHERE batch = ? AND slug = ?',
+                (status, time.time(), round(duration, 3), output_dir, error, self.batch, slug)
+            )
+
+    def jobs(self):
+        with self.lock:
+            rows = self.db.execute(
+                'SELECT slug, company_url, status, attempts, duration, output_dir, error FROM batch_jobs WHERE batch = ? ORDER BY position',
+                (self.batch,)
+            ).fetchall()
+        return [
+            {'slug': r[0], 'company_url': r[1], 'status': r[2], 'attempts': r[3], 'duration': r[4], 'output_dir': r[5], 'error': r[6]}
+            for r in rows
+        ]
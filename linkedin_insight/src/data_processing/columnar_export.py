@@ -0,0 +1,233 @@
+import os
+import sqlite3
+from datetime import datetime
+from ..utils.config import EXPORT_DIR, EXPORT_FORMAT
+from ..utils.logger import setup_logger, span
+from ..utils.seniority import default_classifier
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+logger = setup_logger()
+
+# Typed, columnar copy of the employees and job postings of every snapshot,
+# with the seniority level of each title, for analysis across companies.
+# Snapshots are appended to one dataset under the export directory, and
+# exporting a snapshot again replaces its rows.
+#
+# With pyarrow installed each snapshot becomes one zstd-compressed Parquet
+# file in employees/ and jobs/, with dictionary-encoded company, title and
+# location columns; pq.read_table(f"{EXPORT_DIR}/employees", columns=[...])
+# reads just those columns of every snapshot. Without it the rows go to
+# export.db, an SQLite database where titles and locations are stored once in
+# dictionary tables and the employee_rows and job_rows views join them back.
+
+PARQUET_COMPRESSION = 'zstd'
+EXPORT_DB_NAME = 'export.db'
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS companies (
+    id INTEGER PRIMARY KEY,
+    slug TEXT UNIQUE NOT NULL
+);
+CREATE TABLE IF NOT EXISTS titles (
+    id INTEGER PRIMARY KEY,
+    value TEXT UNIQUE NOT NULL
+);
+CREATE TABLE IF NOT EXISTS locations (
+    id INTEGER PRIMARY KEY,
+    value TEXT UNIQUE NOT NULL
+);
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY,
+    company_id INTEGER NOT NULL REFERENCES companies(id),
+    snapshot TEXT NOT NULL,
+    scraped_at TEXT,
+    exported_at REAL NOT NULL,
+    UNIQUE (company_id, snapshot)
+);
+CREATE TABLE IF NOT EXISTS employees (
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots(id),
+    position INTEGER NOT NULL,
+    name TEXT,
+    title_id INTEGER REFERENCES titles(id),
+    level INTEGER NOT NULL,
+    location_id INTEGER REFERENCES locations(id),
+    profile_url TEXT,
+    PRIMARY KEY (snapshot_id, position)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS jobs (
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots(id),
+    position INTEGER NOT NULL,
+    title_id INTEGER REFERENCES titles(id),
+    level INTEGER NOT NULL,
+    company TEXT,
+    location_id INTEGER REFERENCES locations(id),
+    PRIMARY KEY (snapshot_id, position)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS employees_title ON employees (title_id, level);
+CREATE INDEX IF NOT EXISTS jobs_title ON jobs (title_id, level);
+CREATE VIEW IF NOT EXISTS employee_rows AS
+    SELECT c.slug AS company, s.snapshot, s.scraped_at, e.position, e.name, t.value AS title, e.level,
+           l.value AS location, e.profile_url
+    FROM employees e JOIN snapshots s ON s.id = e.snapshot_id JOIN companies c ON c.id = s.company_id
+    LEFT JOIN titles t ON t.id = e.title_id LEFT JOIN locations l ON l.id = e.location_id;
+CREATE VIEW IF NOT EXISTS job_rows AS
+    SELECT c.slug AS company, s.snapshot, s.scraped_at, j.position, t.value AS title, j.level,
+           j.company AS job_company, l.value AS location
+    FROM jobs j JOIN snapshots s ON s.id = j.snapshot_id JOIN companies c ON c.id = s.company_id
+    LEFT JOIN titles t ON t.id = j.title_id LEFT JOIN locations l ON l.id = j.location_id;
+'''
+
+if pa is not None:
+    DICTIONARY_STRING = pa.dictionary(pa.int32(), pa.string())
+    EMPLOYEE_SCHEMA = pa.schema([
+        ('company', DICTIONARY_STRING), ('snapshot', pa.string()), ('scraped_at', pa.string()),
+        ('position', pa.int32()), ('name', pa.string()), ('title', DICTIONARY_STRING), ('level', pa.int8()),
+        ('location', DICTIONARY_STRING), ('profile_url', pa.string())
+    ])
+    JOB_SCHEMA = pa.schema([
+        ('company', DICTIONARY_STRING), ('snapshot', pa.string()), ('scraped_at', pa.string()),
+        ('position', pa.int32()), ('title', DICTIONARY_STRING), ('level', pa.int8()),
+        ('job_company', DICTIONARY_STRING), ('location', DICTIONARY_STRING)
+    ])
+
+def resolve_export_format(export_format=EXPORT_FORMAT):
+    if export_format == 'auto':
+        return 'parquet' if pa is not None else 'sqlite'
+    if export_format == 'parquet' and pa is None:
+        logger.warning("pyarrow is not installed, exporting to SQLite instead of Parquet.")
+        return 'sqlite'
+    return export_format
+
+def snapshot_name(output_dir):
+    return os.path.basename(os.path.abspath(output_dir))
+
+@span('export.columnar')
+def export_company_network(company_network, company_name, output_dir, export_dir=EXPORT_DIR, export_format=EXPORT_FORMAT,
+                           classifier=default_classifier):
+    export_format = resolve_export_format(export_format)
+    snapshot = snapshot_name(output_dir)
+    scraped_at = company_network.get('scraped_at')
+    employees = [
+        (employee.get('name'), employee.get('title'), employee.get('location'), employee.get('profile_url'))
+        for employee in company_network.get('employees', [])
+    ]
+    jobs = [(job.get('title'), job.get('company'), job.get('location')) for job in company_network.get('job_descriptions', [])]
+    employee_levels = classifier.classify_titles(title for _, title, _, _ in employees)
+    job_levels = classifier.classify_titles(title for title, _, _ in jobs)
+
+    os.makedirs(export_dir, exist_ok=True)
+    if export_format == 'parquet':
+        write_parquet(export_dir, company_name, snapshot, scraped_at, employees, employee_levels, jobs, job_levels)
+    else:
+        write_sqlite(export_dir, company_name, snapshot, scraped_at, employees, employee_levels, jobs, job_levels)
+    logger.info(f"Exported {len(employees)} employees and {len(jobs)} jobs of {snapshot} to {export_dir} ({export_format})")
+    return export_format
+
+def parquet_paths(export_dir, snapshot):
+    return [os.path.join(export_dir, table, f"{snapshot}.parquet") for table in ('employees', 'jobs')]
+
+def write_parquet(export_dir, company_name, snapshot, scraped_at, employees, employee_levels, jobs, job_levels):
+    employee_count, job_count = len(employees), len(jobs)
+    employee_table = pa.Table.from_pydict({
+        'company': [company_name] * employee_count,
+        'snapshot': [snapshot] * employee_count,
+        'scraped_at': [scraped_at] * employee_count,
+        'position': list(range(employee_count)),
+        'name': [row[0] for row in employees],
+        'title': [row[1] for row in employees],
+        'level': employee_levels,
+        'location': [row[2] for row in employees],
+        'profile_url': [row[3] for row in employees]
+    }, schema=EMPLOYEE_SCHEMA)
+    job_table = pa.Table.from_pydict({
+        'company': [company_name] * job_count,
+        'snapshot': [snapshot] * job_count,
+        'scraped_at': [scraped_at] * job_count,
+        'position': list(range(job_count)),
+        'title': [row[0] for row in jobs],
+        'level': job_levels,
+        'job_company': [row[1] for row in jobs],
+        'location': [row[2] for row in jobs]
+    }, schema=JOB_SCHEMA)
+
+    for table, path in zip((employee_table, job_table), parquet_paths(export_dir, snapshot)):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Written to a hidden file and renamed, so dataset readers never see half a snapshot
+        tmp_path = os.path.join(os.path.dirname(path), f".{os.path.basename(path)}.part")
+        pq.write_table(table, tmp_path, compression=PARQUET_COMPRESSION)
+        os.replace(tmp_path, path)
+
+def open_export_db(export_dir):
+    db = sqlite3.connect(os.path.join(export_dir, EXPORT_DB_NAME), timeout=30)
+    db.execute('PRAGMA foreign_keys = ON')
+    db.executescript(SCHEMA)
+    return db
+
+def dictionary_ids(db, table, values):
+    # Stores each distinct value once and maps it to its row id
+    values = {value for value in values if value}
+    db.executemany(f'INSERT OR IGNORE INTO {table} (value) VALUES (?)', [(value,) for value in values])
+    ids = {}
+    for value in values:
+        ids[value] = db.execute(f'SELECT id FROM {table} WHERE value = ?', (value,)).fetchone()[0]
+    return ids
+
+def write_sqlite(export_dir, company_name, snapshot, scraped_at, employees, employee_levels, jobs, job_levels):
+    db = open_export_db(export_dir)
+    try:
+        with db:
+            db.execute('INSERT OR IGNORE INTO companies (slug) VALUES (?)', (company_name,))
+            company_id = db.execute('SELECT id FROM companies WHERE slug = ?', (company_name,)).fetchone()[0]
+            db.execute(
+                'INSERT INTO snapshots (company_id, snapshot, scraped_at, exported_at) VALUES (?, ?, ?, ?) '
+                'ON CONFLICT (company_id, snapshot) DO UPDATE SET scraped_at = excluded.scraped_at, exported_at = excluded.exported_at',
+                (company_id, snapshot, scraped_at, datetime.now().timestamp())
+            )
+            snapshot_id = db.execute('SELECT id FROM snapshots WHERE company_id = ? AND snapshot = ?', (company_id, snapshot)).fetchone()[0]
+            db.execute('DELETE FROM employees WHERE snapshot_id = ?', (snapshot_id,))
+            db.execute('DELETE FROM jobs WHERE snapshot_id = ?', (snapshot_id,))
+
+            title_ids = dictionary_ids(db, 'titles', [row[1] for row in employees] + [row[0] for row in jobs])
+            location_ids = dictionary_ids(db, 'locations', [row[2] for row in employees] + [row[2] for row in jobs])
+            db.executemany(
+                'INSERT INTO employees (snapshot_id, position, name, title_id, level, location_id, profile_url) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                [
+                    (snapshot_id, position, name, title_ids.get(title), level, location_ids.get(location), profile_url)
+                    for position, ((name, title, location, profile_url), level) in enumerate(zip(employees, employee_levels))
+                ]
+            )
+            db.executemany(
+                'INSERT INTO jobs (snapshot_id, position, title_id, level, company, location_id) VALUES (?, ?, ?, ?, ?, ?)',
+                [
+                    (snapshot_id, position, title_ids.get(title), level, job_company, location_ids.get(location))
+                    for position, ((title, job_company, location), level) in enumerate(zip(jobs, job_levels))
+                ]
+            )
+    finally:
+        db.close()
+
+def last_export_time(company_name, output_dir, export_dir=EXPORT_DIR, export_format=EXPORT_FORMAT):
+    # When the snapshot in output_dir was last exported, or None if it never was
+    snapshot = snapshot_name(output_dir)
+    if resolve_export_format(export_format) == 'parquet':
+        paths = parquet_paths(export_dir, snapshot)
+        if not all(os.path.isfile(path) for path in paths):
+            return None
+        return min(os.path.getmtime(path) for path in paths)
+
+    if not os.path.isfile(os.path.join(export_dir, EXPORT_DB_NAME)):
+        return None
+    db = open_export_db(export_dir)
+    try:
+        row = db.execute(
+            'SELECT s.exported_at FROM snapshots s JOIN companies c ON c.id = s.company_id WHERE c.slug = ? AND s.snapshot = ?',
+            (company_name, snapshot)
+        ).fetchone()
+    finally:
+        db.close()
+    return row[0] if row else None
@@ -1,61 +1,71 @@
 import csv
+import hashlib
 import os
-import requests
-import shutil
-from ..utils.logger import setup_logger
-from ..utils.config import GENERIC_USER_IMAGE
+from itertools import islice
+from .image_downloader import create_session, download_images
+from ..utils.logger import setup_logger, span
+from ..utils.config import GENERIC_USER_IMAGE, GENERIC_IMAGE_FILENAME, IMAGE_DOWNLOAD_WORKERS, IMAGE_DOWNLOAD_PER_HOST
 
 logger = setup_logger()
 
-def write_employees_to_csv(employees, output_dir):
+DOWNLOAD_BATCH_SIZE = 500
+
+@span('csv')
+def write_employees_to_csv(employees, output_dir, max_workers=IMAGE_DOWNLOAD_WORKERS, per_host=IMAGE_DOWNLOAD_PER_HOST, image_cache=None):
     csv_filepath = os.path.join(output_dir, 'employees.csv')
     images_dir = os.path.join(output_dir, "images")
     if not os.path.exists(images_dir):
         os.makedirs(images_dir)
-    
-    with open(csv_filepath, mode='w', newline='', encoding='utf-8') as csv_file:
+
+    employee_iter = iter(employees)
+    with create_session(max_workers) as session, open(csv_filepath, mode='w', newline='', encoding='utf-8') as csv_file:
         fieldnames = ['Photo Path', 'First Name', 'Last Name', 'Job Title']
         writer = csv.DictWriter(csv_file, fieldnames=fieldnames)
 
         writer.writeheader()
-        for employee in employees:
-            name = employee.get('name', '')
-            nome, cognome = (name.split(' ', 1) if ' ' in name else (name, '')) if name else ('', '')
-            photo_url = employee.get('photo_url', '')
-            photo_path = ''
-            if photo_url:
-                try:
-                    response = requests.get(photo_url, stream=True, timeout=10)
-                    if response.status_code == 200 and not photo_url.startswith('data:image/gif;base64,'):
-                        sanitized_name = ''.join(c if c.isalnum() else '_' for c in name)
-                        photo_filename = f"{sanitized_name}.jpg"
-                        photo_filepath = os.path.join(images_dir, photo_filename)
-                        with open(photo_filepath, 'wb') as f:
-                            shutil.copyfileobj(response.raw, f)
-                        photo_path = os.path.relpath(photo_filepath, output_dir)
-                        logger.info(f"Image downloaded for {name}: {photo_filepath}")
-                    else:
-                        photo_path = use_generic_image(images_dir, name)
-                        logger.warning(f"Using generic image for {name}")
-                except Exception as e:
-                    photo_path = use_generic_image(images_dir, name)
-                    logger.warning(f"Error downloading image for {name}: {str(e)}. Using generic image.")
-            else:
-                photo_path = use_generic_image(images_dir, name)
-                logger.warning(f"No image URL for {name}. Using generic image.")
-            
-            writer.writerow({
-                'Photo Path': photo_path,
-                'First Name': nome,
-                'Last Name': cognome,
-                'Job Title': employee.get('title', '')
-            })
+        # Employees may be a lazy stream, so photos are fetched one batch at a time
+        for batch in iter(lambda: list(islice(employee_iter, DOWNLOAD_BATCH_SIZE)), []):
+            downloads = [(employee.get('photo_url'), photo_filepath_for(images_dir, employee)) for employee in batch]
+            with span('download'):
+                photo_filepaths = download_images(downloads, max_workers=max_workers, per_host=per_host, session=session, cache=image_cache)
+
+            for employee, (photo_url, _), photo_filepath in zip(batch, downloads, photo_filepaths):
+                writer.writerow(employee_row(employee, photo_url, photo_filepath, output_dir, images_dir, image_cache))
     logger.info(f"CSV file created: {csv_filepath}")
 
-def use_generic_image(images_dir, name):
-    sanitized_name = ''.join(c if c.isalnum() else '_' for c in name)
-    generic_filename = f"generic_{sanitized_name}.svg"
-    generic_filepath = os.path.join(images_dir, generic_filename)
-    with open(generic_filepath, 'w', encoding='utf-8') as f:
-        f.write(GENERIC_USER_IMAGE)
-    return os.path.relpath(generic_filepath, os.path.dirname(images_dir))
\ No newline at end of file
+def photo_filepath_for(images_dir, employee):
+    # The profile (or photo) URL hash keeps namesakes and nameless employees from sharing a file
+    sanitized_name = ''.join(c if c.isalnum() else '_' for c in employee.get('name') or '')
+    identity = employee.get('profile_url') or employee.get('photo_url') or ''
+    digest = hashlib.sha1(identity.encode('utf-8')).hexdigest()[:10]
+    return os.path.join(images_dir, f"{sanitized_name}_{digest}.jpg")
+
+def employee_row(employee, photo_url, photo_filepath, output_dir, images_dir, image_cache=None):
+    name = employee.get('name', '')
+    nome, cognome = (name.split(' ', 1) if ' ' in name else (name, '')) if name else ('', '')
+    if photo_filepath:
+        photo_path = os.path.relpath(photo_filepath, output_dir)
+        logger.info(f"Image downloaded for {name}: {photo_filepath}")
+    elif photo_url:
+        photo_path = use_generic_image(images_dir, image_cache)
+        logger.warning(f"Unable to download image for {name}. Using generic image.")
+    else:
+        photo_path = use_generic_image(images_dir, image_cache)
+        logger.warning(f"No image URL for {name}. Using generic image.")
+
+    return {
+        'Photo Path': photo_path,
+        'First Name': nome,
+        'Last Name': cognome,
+        'Job Title': employee.get('title', '')
+    }
+
+def use_generic_image(images_dir, image_cache=None):
+    generic_filepath = os.path.join(images_dir, GENERIC_IMAGE_FILENAME)
+    if not os.path.exists(generic_filepath):
+        if image_cache is not None:
+            image_cache.link(image_cache.put_bytes(GENERIC_USER_IMAGE.encode('utf-8')), generic_filepath)
+        else:
+            with open(generic_filepath, 'w', encoding='utf-8') as f:
+                f.write(GENERIC_USER_IMAGE)
+    return os.path.relpath(generic_filepath, os.path.dirname(images_dir))
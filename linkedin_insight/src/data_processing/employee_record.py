@@ -0,0 +1,256 @@
+import sys
+from array import array
+
+# Compact, read-only employee record for data loaded from snapshots. Titles,
+# locations and URL prefixes are interned, so the many employees sharing a
+# title, or the "https://www.linkedin.com/in/" of their profile URL, share one
+# string. Fields other than the card fields and the location (experience,
+# education, profile_saved_at) live in a separate dict that only exists when
+# there are any.
+#
+# Records answer get(), [] and `in` like the dicts the stages were written
+# for, and dict(record) gives back the dict they were built from, including
+# fields that were None. Stages derive what they need (levels, photo paths)
+# into their own structures instead of writing to the record; with_fields()
+# returns an updated copy.
+#
+# EmployeeTable keeps a whole snapshot in columns (packed UTF-8 for the
+# unique strings, ids into one dictionary for the repeated ones) and hands out
+# records on access, for when many snapshots are held in memory at once.
+
+CARD_FIELDS = ('name', 'title', 'profile_url', 'photo_url')
+FIELDS = CARD_FIELDS + ('location',)
+# Leading path segments shared by every profile or photo URL. Anything else is
+# split after the host, so the interned prefixes stay few whatever the URLs.
+URL_PREFIXES = ('/dms/image/v2/', '/dms/image/', '/in/')
+
+# Marks a card field the employee did not have, as opposed to one set to None
+MISSING = object()
+
+def split_url(url):
+    if not isinstance(url, str) or '//' not in url:
+        return None, url
+    host_end = url.find('/', url.index('//') + 2)
+    if host_end < 0:
+        return None, url
+    cut = host_end + 1
+    for prefix in URL_PREFIXES:
+        if url.startswith(prefix, host_end):
+            cut = host_end + len(prefix)
+            break
+    return sys.intern(url[:cut]), url[cut:]
+
+def join_url(prefix, rest):
+    if prefix is None:
+        return rest
+    return prefix + rest
+
+def intern_text(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+class Employee:
+    __slots__ = ('_name', '_title', '_profile_prefix', '_profile_rest', '_photo_prefix', '_photo_rest', '_location', '_extra')
+
+    def __init__(self, name=MISSING, title=MISSING, profile_url=MISSING, photo_url=MISSING, location=MISSING, **extra):
+        set_field = object.__setattr__
+        set_field(self, '_name', name)
+        set_field(self, '_title', intern_text(title))
+        profile_prefix, profile_rest = split_url(profile_url)
+        set_field(self, '_profile_prefix', profile_prefix)
+        set_field(self, '_profile_rest', profile_rest)
+        photo_prefix, photo_rest = split_url(photo_url)
+        set_field(self, '_photo_prefix', photo_prefix)
+        set_field(self, '_photo_rest', photo_rest)
+        set_field(self, '_location', intern_text(location))
+        set_field(self, '_extra', extra or None)
+
+    @classmethod
+    def from_dict(cls, data):
+        if isinstance(data, cls):
+            return data
+        return cls(**data)
+
+    @classmethod
+    def _from_parts(cls, name, title, profile_prefix, profile_rest, photo_prefix, photo_rest, location, extra):
+        record = object.__new__(cls)
+        set_field = object.__setattr__
+        set_field(record, '_name', name)
+        set_field(record, '_title', title)
+        set_field(record, '_profile_prefix', profile_prefix)
+        set_field(record, '_profile_rest', profile_rest)
+        set_field(record, '_photo_prefix', photo_prefix)
+        set_field(record, '_photo_rest', photo_rest)
+        set_field(record, '_location', location)
+        set_field(record, '_extra', extra)
+        return record
+
+    @property
+    def name(self):
+        return self.get('name')
+
+    @property
+    def title(self):
+        return self.get('title')
+
+    @property
+    def profile_url(self):
+        return self.get('profile_url')
+
+    @property
+    def photo_url(self):
+        return self.get('photo_url')
+
+    def with_fields(self, **fields):
+        return Employee(**{**dict(self), **fields})
+
+    def keys(self):
+        keys = [field for field in FIELDS if self._field(field) is not MISSING]
+        if self._extra:
+            keys.extend(self._extra)
+        return keys
+
+    def get(self, key, default=None):
+        if key in FIELDS:
+            value = self._field(key)
+            return default if value is MISSING else value
+        if self._extra:
+            return self._extra.get(key, default)
+        return default
+
+    def __getitem__(self, key):
+        value = self.get(key, MISSING)
+        if value is MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        if key in FIELDS:
+            return self._field(key) is not MISSING
+        return bool(self._extra) and key in self._extra
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Employee records are read-only, use with_fields()")
+
+    def __eq__(self, other):
+        if isinstance(other, (Employee, dict)):
+            return dict(self) == dict(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __reduce__(self):
+        return (Employee.from_dict, (dict(self),))
+
+    def __repr__(self):
+        return f"Employee({dict(self)!r})"
+
+    def _field(self, key):
+        if key == 'name':
+            return self._name
+        if key == 'title':
+            return self._title
+        if key == 'profile_url':
+            return join_url(self._profile_prefix, self._profile_rest)
+        if key == 'photo_url':
+            return join_url(self._photo_prefix, self._photo_rest)
+        return self._location
+
+# Codes of the dictionary columns for values that are not strings
+MISSING_ID = -1
+NONE_ID = -2
+
+class PackedStrings:
+    # One column of mostly unique strings, stored as UTF-8 in a single buffer
+    STRING, NONE, ABSENT = 0, 1, 2
+
+    def __init__(self):
+        self.data = bytearray()
+        self.ends = array('Q')
+        self.states = array('b')
+
+    def append(self, value):
+        if isinstance(value, str):
+            self.data += value.encode('utf-8')
+            state = self.STRING
+        elif value is None:
+            state = self.NONE
+        elif value is MISSING:
+            state = self.ABSENT
+        else:
+            raise TypeError(f"Expected a string or None, got {type(value).__name__}")
+        self.ends.append(len(self.data))
+        self.states.append(state)
+
+    def __getitem__(self, index):
+        state = self.states[index]
+        if state == self.NONE:
+            return None
+        if state == self.ABSENT:
+            return MISSING
+        start = self.ends[index - 1] if index else 0
+        return self.data[start:self.ends[index]].decode('utf-8')
+
+class EmployeeTable:
+    def __init__(self, employees=()):
+        self._dictionary = []
+        self._ids = {}
+        self._names = PackedStrings()
+        self._titles = array('i')
+        self._profile_prefixes = array('i')
+        self._profile_rests = PackedStrings()
+        self._photo_prefixes = array('i')
+        self._photo_rests = PackedStrings()
+        self._locations = array('i')
+        self._extras = []
+        for employee in employees:
+            self.append(employee)
+
+    def append(self, employee):
+        record = Employee.from_dict(employee)
+        self._names.append(record._name)
+        self._titles.append(self._code(record._title))
+        self._profile_prefixes.append(self._code(record._profile_prefix))
+        self._profile_rests.append(record._profile_rest)
+        self._photo_prefixes.append(self._code(record._photo_prefix))
+        self._photo_rests.append(record._photo_rest)
+        self._locations.append(self._code(record._location))
+        self._extras.append(record._extra)
+
+    def __len__(self):
+        return len(self._extras)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("employee index out of range")
+        return Employee._from_parts(
+            self._names[index], self._value(self._titles[index]),
+            self._value(self._profile_prefixes[index]), self._profile_rests[index],
+            self._value(self._photo_prefixes[index]), self._photo_rests[index],
+            self._value(self._locations[index]), self._extras[index]
+        )
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def _code(self, value):
+        if value is MISSING:
+            return MISSING_ID
+        if value is None:
+            return NONE_ID
+        if not isinstance(value, str):
+            raise TypeError(f"Expected a string or None, got {type(value).__name__}")
+        code = self._ids.get(value)
+        if code is None:
+            code = self._ids[value] = len(self._dictionary)
+            self._dictionary.append(value)
+        return code
+
+    def _value(self, code):
+        if code == MISSING_ID:
+            return MISSING
+        if code == NONE_ID:
+            return None
+        return self._dictionary[code]
@@ -0,0 +1,216 @@
+import hashlib
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from ..utils.logger import setup_logger
+from ..utils.config import IMAGE_CACHE_DIR, IMAGE_CACHE_MAX_BYTES, IMAGE_CACHE_MAX_AGE
+
+logger = setup_logger()
+
+# Stores between two checks of the total size against the index, which also
+# sees the photos added by other processes sharing the cache
+EVICTION_CHECK_INTERVAL = 200
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS urls (
+    url_hash TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    checked_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS blobs (
+    content_hash TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS blobs_last_access ON blobs (last_access);
+CREATE INDEX IF NOT EXISTS urls_content_hash ON urls (content_hash);
+'''
+
+def open_image_cache(args):
+    if getattr(args, 'no_image_cache', False):
+        return None
+    try:
+        return ImageCache(getattr(args, 'image_cache_dir', None) or IMAGE_CACHE_DIR)
+    except (OSError, sqlite3.Error) as e:
+        logger.warning(f"Image cache unavailable, downloading without it: {str(e)}")
+        return None
+
+def url_hash(url):
+    return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+class ImageCache:
+    def __init__(self, root=IMAGE_CACHE_DIR, max_bytes=IMAGE_CACHE_MAX_BYTES, max_age=IMAGE_CACHE_MAX_AGE):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.blobs_dir = os.path.join(root, 'blobs')
+        self.tmp_dir = os.path.join(root, 'tmp')
+        os.makedirs(self.blobs_dir, exist_ok=True)
+        os.makedirs(self.tmp_dir, exist_ok=True)
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(os.path.join(root, 'index.sqlite3'), timeout=30, check_same_thread=False)
+        self.db.executescript(SCHEMA)
+        # Running size of the blobs, so storing a photo does not scan the index
+        self.total_bytes = self._stored_bytes()
+        self.stores_since_check = 0
+
+    def close(self):
+        with self.lock:
+            self.db.close()
+
+    def blob_path(self, content_hash):
+        return os.path.join(self.blobs_dir, content_hash[:2], content_hash)
+
+    def get_fresh(self, url):
+        entry = self._url_entry(url)
+        if not entry or time.time() - entry['checked_at'] > self.max_age:
+            return None
+        return self._touch(entry['content_hash'])
+
+    def fetch(self, session, url, timeout):
+        entry = self._url_entry(url)
+        headers = {}
+        if entry and os.path.exists(self.blob_path(entry['content_hash'])):
+            if entry['etag']:
+                headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        not_modified = False
+        with session.get(url, stream=True, timeout=timeout, headers=headers) as response:
+            if response.status_code == 304 and headers:
+                not_modified = True
+            elif response.status_code != 200:
+                return response.status_code, None
+            else:
+                content_hash, blob_path = self._store(response.iter_content(chunk_size=64 * 1024))
+                etag = response.headers.get('ETag')
+                last_modified = response.headers.get('Last-Modified')
+
+        if not_modified:
+            blob_path = self._touch(entry['content_hash'])
+            if blob_path is None:
+                # Evicted while the request was in flight, fetch it again without validators
+                return self.fetch(session, url, timeout)
+            with self.lock, self.db:
+                self.db.execute('UPDATE urls SET checked_at = ? WHERE url_hash = ?', (time.time(), url_hash(url)))
+            logger.debug(f"Image not modified, reusing cached copy: {url}")
+            return 200, blob_path
+
+        with self.lock, self.db:
+            self.db.execute(
+                'INSERT OR REPLACE INTO urls (url_hash, url, content_hash, etag, last_modified, checked_at) VALUES (?, ?, ?, ?, ?, ?)',
+                (url_hash(url), url, content_hash, etag, last_modified, time.time())
+            )
+        self.evict()
+        return 200, blob_path
+
+    def put_bytes(self, data):
+        content_hash = hashlib.sha256(data).hexdigest()
+        blob_path = self.blob_path(content_hash)
+        if os.path.exists(blob_path):
+            return self._touch(content_hash)
+        return self._store([data])[1]
+
+    def link(self, blob_path, dest_path):
+        try:
+            if os.path.samefile(blob_path, dest_path):
+                return dest_path
+        except OSError:
+            pass
+
+        tmp_path = f"{dest_path}.{threading.get_ident()}.link"
+        try:
+            try:
+                os.link(blob_path, tmp_path)
+            except OSError:
+                try:
+                    os.symlink(os.path.relpath(blob_path, os.path.dirname(dest_path)), tmp_path)
+                except OSError:
+                    shutil.copyfile(blob_path, tmp_path)
+            os.replace(tmp_path, dest_path)
+        finally:
+            if os.path.lexists(tmp_path):
+                os.remove(tmp_path)
+        return dest_path
+
+    def evict(self):
+        with self.lock:
+            if self.total_bytes <= self.max_bytes and self.stores_since_check < EVICTION_CHECK_INTERVAL:
+                return
+            total = self.total_bytes = self._stored_bytes()
+            self.stores_since_check = 0
+            if total <= self.max_bytes:
+                return
+            evicted = []
+            for content_hash, size in self.db.execute('SELECT content_hash, size FROM blobs ORDER BY last_access').fetchall():
+                if total <= self.max_bytes:
+                    break
+                evicted.append(content_hash)
+                total -= size
+            with self.db:
+                self.db.executemany('DELETE FROM blobs WHERE content_hash = ?', [(h,) for h in evicted])
+                self.db.executemany('DELETE FROM urls WHERE content_hash = ?', [(h,) for h in evicted])
+            self.total_bytes = total
+
+        for content_hash in evicted:
+            try:
+                os.remove(self.blob_path(content_hash))
+            except OSError:
+                pass
+        logger.info(f"Evicted {len(evicted)} images from cache {self.root}")
+
+    def _stored_bytes(self):
+        return self.db.execute('SELECT COALESCE(SUM(size), 0) FROM blobs').fetchone()[0]
+
+    def _url_entry(self, url):
+        with self.lock:
+            row = self.db.execute(
+                'SELECT content_hash, etag, last_modified, checked_at FROM urls WHERE url_hash = ?', (url_hash(url),)
+            ).fetchone()
+        if not row:
+            return None
+        return {'content_hash': row[0], 'etag': row[1], 'last_modified': row[2], 'checked_at': row[3]}
+
+    def _touch(self, content_hash):
+        blob_path = self.blob_path(content_hash)
+        if not os.path.exists(blob_path):
+            return None
+        with self.lock, self.db:
+            self.db.execute('UPDATE blobs SET last_access = ? WHERE content_hash = ?', (time.time(), content_hash))
+        return blob_path
+
+    def _store(self, chunks):
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=self.tmp_dir)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                for chunk in chunks:
+                    digest.update(chunk)
+                    size += len(chunk)
+                    f.write(chunk)
+            content_hash = digest.hexdigest()
+            blob_path = self.blob_path(content_hash)
+            os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+            if not os.path.exists(blob_path):
+                os.replace(tmp_path, blob_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+        with self.lock, self.db:
+            if self.db.execute('SELECT 1 FROM blobs WHERE content_hash = ?', (content_hash,)).fetchone() is None:
+                self.total_bytes += size
+                self.stores_since_check += 1
+            self.db.execute(
+                'INSERT OR REPLACE INTO blobs (content_hash, size, last_access) VALUES (?, ?, ?)',
+                (content_hash, size, time.time())
+            )
+        return content_hash, blob_path
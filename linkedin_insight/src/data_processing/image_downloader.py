@@ -0,0 +1,125 @@
+import os
+import sqlite3
+import threading
+import time
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
+from ..utils.logger import setup_logger
+from ..utils.config import (
+    IMAGE_DOWNLOAD_WORKERS, IMAGE_DOWNLOAD_PER_HOST, IMAGE_DOWNLOAD_RETRIES,
+    IMAGE_DOWNLOAD_BACKOFF, IMAGE_DOWNLOAD_TIMEOUT
+)
+
+logger = setup_logger()
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+def create_session(pool_size=IMAGE_DOWNLOAD_WORKERS):
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+def is_downloadable(url):
+    return bool(url) and urlparse(url).scheme in ('http', 'https')
+
+def download_images(downloads, max_workers=IMAGE_DOWNLOAD_WORKERS, per_host=IMAGE_DOWNLOAD_PER_HOST,
+                    retries=IMAGE_DOWNLOAD_RETRIES, backoff=IMAGE_DOWNLOAD_BACKOFF,
+                    timeout=IMAGE_DOWNLOAD_TIMEOUT, session=None, cache=None):
+    downloads = list(downloads)
+    if not downloads:
+        return []
+
+    owns_session = session is None
+    if owns_session:
+        session = create_session(max_workers)
+    host_limits = HostLimits(per_host)
+
+    def fetch(download):
+        url, dest_path = download
+        return fetch_image(session, url, dest_path, host_limits, retries, backoff, timeout, cache)
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            # map() yields results in submission order, whatever order the downloads finish in
+            return list(executor.map(fetch, downloads))
+    finally:
+        if owns_session:
+            session.close()
+
+def fetch_image(session, url, dest_path, host_limits, retries, backoff, timeout, cache=None):
+    if not is_downloadable(url):
+        return None
+
+    try:
+        if cache is not None:
+            blob_path = cache.get_fresh(url)
+            if blob_path:
+                return cache.link(blob_path, dest_path)
+        return fetch_with_retries(session, url, dest_path, host_limits, retries, backoff, timeout, cache)
+    except (OSError, sqlite3.Error) as e:
+        # Writing or linking the file failed, which another attempt will not fix
+        logger.warning(f"Unable to save image {url} to {dest_path}: {str(e)}")
+        return None
+
+def fetch_with_retries(session, url, dest_path, host_limits, retries, backoff, timeout, cache):
+    host = urlparse(url).netloc
+    for attempt in range(retries + 1):
+        try:
+            with host_limits.acquire(host):
+                status_code = fetch_once(session, url, dest_path, timeout, cache)
+            if status_code == 200:
+                return dest_path
+            if status_code not in RETRY_STATUS_CODES:
+                logger.warning(f"Image request for {url} returned HTTP {status_code}")
+                return None
+            error = f"HTTP {status_code}"
+        except requests.RequestException as e:
+            error = str(e)
+
+        if attempt < retries:
+            delay = backoff * (2 ** attempt)
+            logger.debug(f"Retrying image {url} in {delay:.2f} seconds ({error})")
+            time.sleep(delay)
+
+    logger.warning(f"Giving up on image {url} after {retries + 1} attempts: {error}")
+    return None
+
+def fetch_once(session, url, dest_path, timeout, cache):
+    if cache is not None:
+        status_code, blob_path = cache.fetch(session, url, timeout)
+        if status_code == 200:
+            cache.link(blob_path, dest_path)
+        return status_code
+
+    with session.get(url, stream=True, timeout=timeout) as response:
+        if response.status_code == 200:
+            write_response(response, dest_path)
+        return response.status_code
+
+def write_response(response, dest_path):
+    # Write to a private temporary file so a failed or concurrent download never leaves a partial image behind
+    tmp_path = f"{dest_path}.{threading.get_ident()}.part"
+    try:
+        with open(tmp_path, 'wb') as f:
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                f.write(chunk)
+        os.replace(tmp_path, dest_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+class HostLimits:
+    def __init__(self, per_host):
+        self.per_host = max(1, per_host)
+        self.semaphores = {}
+        self.lock = threading.Lock()
+
+    def acquire(self, host):
+        with self.lock:
+            if host not in self.semaphores:
+                self.semaphores[host] = threading.BoundedSemaphore(self.per_host)
+            return self.semaphores[host]
@@ -0,0 +1,120 @@
+import json
+import os
+from datetime import datetime, timedelta
+from urllib.parse import urlsplit
+from .employee_record import EmployeeTable
+from .jsonl_stream import load_company_network
+from .snapshot_store import open_snapshot_store
+from ..utils.logger import setup_logger
+
+logger = setup_logger()
+
+# Employees are matched on their profile URL without the query string. Photo
+# URLs carry signed, expiring tokens that change on every scan, so only these
+# fields decide whether a matched card has changed.
+CARD_FIELDS = ('name', 'title')
+# Filled in from the profile page, and carried forward when a visit is skipped
+PROFILE_FIELDS = ('location', 'experience', 'education')
+
+def find_previous_snapshot(company_name):
+    snapshot = open_snapshot_store().latest_snapshot(company_name, with_data=True)
+    if snapshot and os.path.isfile(snapshot['data_path']):
+        return snapshot['data_path']
+    return None
+
+def load_previous_snapshot(company_name):
+    json_path = find_previous_snapshot(company_name)
+    if not json_path:
+        logger.info(f"No previous snapshot found for {company_name}, running a full scan.")
+        return None
+    try:
+        company_network = load_company_network(json_path)
+        company_network['employees'] = EmployeeTable(company_network.get('employees', []))
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning(f"Unable to read previous snapshot {json_path}: {str(e)}")
+        return None
+
+    if not company_network.get('scraped_at'):
+        company_network['scraped_at'] = datetime.fromtimestamp(os.path.getmtime(json_path)).isoformat(timespec='seconds')
+    company_network['snapshot_path'] = json_path
+    logger.info(f"Using previous snapshot {json_path} from {company_network['scraped_at']}")
+    return company_network
+
+def employee_key(employee):
+    profile_url = employee.get('profile_url')
+    if profile_url:
+        parts = urlsplit(profile_url)
+        return f"{parts.netloc}{parts.path}".rstrip('/')
+    return employee.get('name')
+
+def diff_employees(previous_employees, current_employees):
+    previous_by_key = {employee_key(e): e for e in previous_employees if employee_key(e)}
+    current_keys = set()
+    delta = {'added': [], 'removed': [], 'changed': [], 'unchanged': []}
+
+    for employee in current_employees:
+        key = employee_key(employee)
+        current_keys.add(key)
+        previous = previous_by_key.get(key)
+        if previous is None:
+            delta['added'].append(employee)
+        elif any(previous.get(field) != employee.get(field) for field in CARD_FIELDS):
+            delta['changed'].append({'before': previous, 'after': employee})
+        else:
+            delta['unchanged'].append(employee)
+
+    delta['removed'] = [e for key, e in previous_by_key.items() if key not in current_keys]
+    return delta
+
+def carry_forward_profiles(previous_network, employees, profile_ttl, now=None):
+    now = now or datetime.now()
+    delta = diff_employees(previous_network.get('employees', []), employees)
+    previous_by_key = {employee_key(e): e for e in previous_network.get('employees', [])}
+    skip_keys = set()
+    # Snapshots from before profile_saved_at only have the scan time. Once any
+    # employee carries the stamp, one without it never had its profile saved.
+    legacy = not any('profile_saved_at' in e for e in previous_by_key.values())
+
+    for employee in delta['unchanged']:
+        previous = previous_by_key[employee_key(employee)]
+        saved_at = previous.get('profile_saved_at')
+        if saved_at is None and legacy:
+            saved_at = previous_network.get('scraped_at')
+        try:
+            age = now - datetime.fromisoformat(saved_at)
+        except (TypeError, ValueError):
+            continue
+        if age < timedelta(seconds=profile_ttl):
+            employee['profile_saved_at'] = saved_at
+            for field in PROFILE_FIELDS:
+                if field in previous:
+                    employee[field] = previous[field]
+            skip_keys.add(employee_key(employee))
+
+    logger.info(f"Incremental scan: {len(skip_keys)} of {len(employees)} profiles are unchanged and within TTL")
+    return skip_keys
+
+def write_delta(previous_network, company_network, company_name, output_dir):
+    delta = diff_employees(previous_network.get('employees', []), company_network.get('employees', []))
+    delta_file = os.path.join(output_dir, f"{company_name}_delta.json")
+    report = {
+        'previous_snapshot': previous_network.get('snapshot_path'),
+        'previous_scraped_at': previous_network.get('scraped_at'),
+        'scraped_at': company_network.get('scraped_at'),
+        'summary': {
+            'added': len(delta['added']),
+            'removed': len(delta['removed']),
+            'changed': len(delta['changed']),
+            'unchanged': len(delta['unchanged'])
+        },
+        'added': [dict(e) for e in delta['added']],
+        'removed': [dict(e) for e in delta['removed']],
+        'changed': [{'before': dict(c['before']), 'after': dict(c['after'])} for c in delta['changed']]
+    }
+    try:
+        with open(delta_file, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=4)
+        logger.info(f"Delta file created: {delta_file} ({report['summary']})")
+    except Exception as e:
+        logger.error(f"Error saving delta file: {str(e)}")
+    return delta_file
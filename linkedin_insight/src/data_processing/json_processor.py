@@ -1,59 +1,146 @@
-import json
+import glob
 import os
-from datetime import datetime, timedelta
+import time
+from concurrent.futures import ProcessPoolExecutor
 from ..utils.logger import setup_logger
+from ..utils.config import JSON_WORKERS
 from .csv_generator import write_employees_to_csv
-from ..visualization.hierarchy_pyramid import create_hierarchy_pyramid
-from ..visualization.html_generator import create_html_pyramid
+from .image_cache import open_image_cache
+from .jsonl_stream import load_company_network
+from .snapshot_store import open_snapshot_store, find_fresh_snapshot, create_company_directory, company_name_from_directory
+from ..utils.seniority import get_classifier
 
 logger = setup_logger()
 
+DATA_FILE_PATTERN = '*_linkedin_data.json*'
+
 def process_json(json_path, company_name_input, args):
+    return process_json_file((json_path, company_name_input, args))['output_dir']
+
+# Reprocesses many data files at once, one process per file. Each file is
+# skipped when the outputs requested by args are already newer than it, unless
+# args.force is set.
+def process_json_files(json_paths, args, max_workers=JSON_WORKERS):
+    tasks = [(json_path, company_name_from_json_path(json_path), args) for json_path in json_paths]
+    started = time.perf_counter()
+    workers = max(1, min(max_workers, len(tasks)))
+    if workers == 1:
+        results = [process_json_file(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(process_json_file, tasks))
+    elapsed = time.perf_counter() - started
+
+    summary = {}
+    for result in results:
+        summary[result['status']] = summary.get(result['status'], 0) + 1
+    print(f"Processed {len(results)} JSON files in {elapsed:.1f}s with {workers} workers: {summary}")
+    logger.info(f"Processed {len(results)} JSON files in {elapsed:.1f}s with {workers} workers: {summary}")
+    for result in results:
+        if result['status'] == 'failed':
+            print(f"  Failed: {result['path']}: {result['error']}")
+    return results
+
+def process_json_file(task):
+    json_path, company_name_input, args = task
+    started = time.perf_counter()
+    result = {'path': json_path, 'company': company_name_input, 'status': 'failed', 'output_dir': None, 'error': None}
+    image_cache = None
     try:
-        with open(json_path, 'r', encoding='utf-8') as f:
-            company_network = json.load(f)
-        
-        cached_dir = cache_exists(company_name_input)
-        if cached_dir:
-            output_dir = cached_dir
+        company_network = load_company_network(json_path)
+        output_dir = output_dir_for(json_path, company_name_input)
+        result['output_dir'] = output_dir
+
+        if not args.force and is_up_to_date(json_path, company_name_input, output_dir, company_network, args):
+            logger.info(f"Outputs in {output_dir} are newer than {json_path}, skipping")
+            result['status'] = 'skipped'
         else:
-            output_dir = create_company_directory(company_name_input)
-        
-        employees = company_network.get('employees', [])
-        write_employees_to_csv(employees, output_dir)
-        
-        if args.create_pyramid:
-            company_name = company_network.get('company', {}).get('name', 'company')
-            create_hierarchy_pyramid(employees, company_name, output_dir)
-        
-        if args.create_html_pyramid:
-            create_html_pyramid(company_network, output_dir)
-        
-        logger.info(f"JSON processing completed. Output directory: {output_dir}")
-        return output_dir
+            image_cache = open_image_cache(args)
+            process_company_network(company_network, json_path, company_name_input, output_dir, args, image_cache)
+            result['status'] = 'done'
     except Exception as e:
-        logger.error(f"Error processing JSON file: {str(e)}")
-        return None
-
-def cache_exists(company_name):
-    base_path = os.getcwd()
-    company_dirs = [d for d in os.listdir(base_path) if os.path.isdir(d) and company_name in d]
-    for directory in company_dirs:
-        try:
-            dir_date_str = directory.split('_')[-1]
-            dir_date = datetime.strptime(dir_date_str, '%Y-%m-%d')
-            if datetime.now() - dir_date < timedelta(days=3):
-                return directory
-        except ValueError:
+        logger.error(f"Error processing JSON file {json_path}: {str(e)}")
+        result['error'] = str(e)
+    finally:
+        if image_cache is not None:
+            image_cache.close()
+    result['duration'] = round(time.perf_counter() - started, 3)
+    return result
+
+def process_company_network(company_network, json_path, company_name_input, output_dir, args, image_cache=None):
+    open_snapshot_store().save_company_network(company_name_input, output_dir, company_network, json_path)
+
+    employees = company_network.get('employees', [])
+    write_employees_to_csv(employees, output_dir, max_workers=args.download_workers, per_host=args.per_host_downloads, image_cache=image_cache)
+
+    if args.export:
+        from .columnar_export import export_company_network
+        export_company_network(company_network, company_name_input, output_dir, export_dir=args.export_dir, export_format=args.export_format, classifier=get_classifier(args.seniority_rules))
+
+    if args.create_pyramid:
+        from ..visualization.hierarchy_pyramid import create_hierarchy_pyramid
+        company_name = company_network.get('company', {}).get('name', 'company')
+        create_hierarchy_pyramid(employees, company_name, output_dir, classifier=get_classifier(args.seniority_rules), output_format=args.pyramid_format, aggregate_threshold=args.pyramid_threshold)
+
+    if args.create_html_pyramid:
+        from ..visualization.html_generator import create_html_pyramid
+        create_html_pyramid(company_network, output_dir, classifier=get_classifier(args.seniority_rules), mode=args.html_pyramid_mode)
+
+    logger.info(f"JSON processing completed. Output directory: {output_dir}")
+
+def output_dir_for(json_path, company_name):
+    # A data file inside its own snapshot directory is reprocessed in place
+    directory = os.path.dirname(json_path) or '.'
+    directory_name = os.path.basename(os.path.abspath(directory))
+    if directory_name != company_name and company_name_from_directory(directory) == company_name:
+        return directory
+    return find_fresh_snapshot(company_name) or create_company_directory(company_name)
+
+def is_up_to_date(json_path, company_name, output_dir, company_network, args):
+    if not outputs_up_to_date(json_path, expected_outputs(output_dir, company_network, args)):
+        return False
+    if args.export:
+        from .columnar_export import last_export_time
+        exported_at = last_export_time(company_name, output_dir, args.export_dir, args.export_format)
+        return exported_at is not None and exported_at > os.path.getmtime(json_path)
+    return True
+
+def expected_outputs(output_dir, company_network, args):
+    company_name = company_network.get('company', {}).get('name', 'company')
+    outputs = [os.path.join(output_dir, 'employees.csv')]
+    if args.create_pyramid:
+        outputs.append(os.path.join(output_dir, f"{company_name}_hierarchy_pyramid.{args.pyramid_format}"))
+    if args.create_html_pyramid:
+        outputs.append(os.path.join(output_dir, f"{company_name}_pyramid.html"))
+    return outputs
+
+def outputs_up_to_date(json_path, outputs):
+    input_mtime = os.path.getmtime(json_path)
+    return all(os.path.isfile(output) and os.path.getmtime(output) > input_mtime for output in outputs)
+
+def company_name_from_json_path(json_path):
+    return os.path.splitext(os.path.basename(json_path))[0].replace('_linkedin_data', '')
+
+def expand_json_paths(inputs):
+    # Inputs can be files, glob patterns or directories, which are searched
+    # recursively for data files. A legacy .json next to its .jsonl is dropped.
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            matches = sorted(glob.glob(os.path.join(item, '**', DATA_FILE_PATTERN), recursive=True))
+        elif glob.has_magic(item):
+            matches = sorted(glob.glob(item, recursive=True))
+        elif os.path.isfile(item):
+            matches = [item]
+        else:
+            print(f"Specified JSON file does not exist: {item}")
+            logger.error(f"Specified JSON file does not exist: {item}")
             continue
-    return None
-
-def create_company_directory(company_name):
-    today = datetime.today().strftime('%Y-%m-%d')
-    directory_name = f"{company_name}_{today}"
-    if not os.path.exists(directory_name):
-        os.makedirs(directory_name)
-    images_dir = os.path.join(directory_name, "images")
-    if not os.path.exists(images_dir):
-        os.makedirs(images_dir)
-    return directory_name
\ No newline at end of file
+        matches = [path for path in matches if path.endswith(('.json', '.jsonl')) and os.path.isfile(path)]
+        if not matches:
+            logger.warning(f"No JSON files found for {item}")
+        paths.extend(matches)
+
+    jsonl_stems = {os.path.splitext(path)[0] for path in paths if path.endswith('.jsonl')}
+    paths = [path for path in paths if path.endswith('.jsonl') or os.path.splitext(path)[0] not in jsonl_stems]
+    return list(dict.fromkeys(os.path.normpath(path) for path in paths))
@@ -0,0 +1,108 @@
+import json
+import os
+from .employee_record import Employee, EmployeeTable
+from ..utils.logger import setup_logger
+
+logger = setup_logger()
+
+FORMAT_VERSION = 1
+
+# A company network is stored as JSON Lines: one header record with the company
+# details, then one record per job posting, then one record per employee. The
+# employee section can be read lazily, any number of times, without loading
+# the rest of the file. Loaded employees are read-only Employee records, and
+# legacy files, which are loaded whole, keep them in an EmployeeTable.
+
+def data_file_path(output_dir, company_name):
+    return os.path.join(output_dir, f"{company_name}_linkedin_data.jsonl")
+
+def find_data_file(output_dir, company_name):
+    for extension in ('.jsonl', '.json'):
+        path = os.path.join(output_dir, f"{company_name}_linkedin_data{extension}")
+        if os.path.isfile(path):
+            return path
+    return None
+
+def write_company_network(company_network, path):
+    writer = CompanyNetworkWriter(path)
+    try:
+        writer.write_header(company_network.get('company', {}), company_network.get('scraped_at'))
+        for job in company_network.get('job_descriptions', []):
+            writer.write_job(job)
+        for employee in company_network.get('employees', []):
+            writer.write_employee(employee)
+    except Exception:
+        writer.abort()
+        raise
+    writer.close()
+    return path
+
+def load_company_network(path):
+    if not path.endswith('.jsonl'):
+        with open(path, 'r', encoding='utf-8') as f:
+            company_network = json.load(f)
+        company_network['employees'] = EmployeeTable(company_network.get('employees', []))
+        return company_network
+
+    company_network = {'company': {}, 'job_descriptions': []}
+    with open(path, 'rb') as f:
+        offset = 0
+        for line in iter(f.readline, b''):
+            record = json.loads(line)
+            if record['type'] == 'header':
+                company_network['company'] = record.get('company') or {}
+                if record.get('scraped_at'):
+                    company_network['scraped_at'] = record['scraped_at']
+            elif record['type'] == 'job':
+                company_network['job_descriptions'].append(record['data'])
+            else:
+                break
+            offset = f.tell()
+    company_network['employees'] = EmployeeStream(path, offset)
+    return company_network
+
+class EmployeeStream:
+    def __init__(self, path, offset=0):
+        self.path = path
+        self.offset = offset
+
+    def __iter__(self):
+        with open(self.path, 'rb') as f:
+            f.seek(self.offset)
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if record['type'] == 'employee':
+                    yield Employee.from_dict(record['data'])
+
+class CompanyNetworkWriter:
+    def __init__(self, path):
+        self.path = path
+        self.tmp_path = f"{path}.part"
+        self.file = open(self.tmp_path, 'w', encoding='utf-8')
+        self.employee_count = 0
+
+    def write_header(self, company, scraped_at=None):
+        self._write({'type': 'header', 'version': FORMAT_VERSION, 'company': company, 'scraped_at': scraped_at})
+
+    def write_job(self, job):
+        self._write({'type': 'job', 'data': job})
+
+    def write_employee(self, employee):
+        self._write({'type': 'employee', 'data': dict(employee)})
+        self.employee_count += 1
+
+    def close(self):
+        self.file.close()
+        os.replace(self.tmp_path, self.path)
+        logger.info(f"Company network written: {self.path} ({self.employee_count} employees)")
+
+    def abort(self):
+        self.file.close()
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+
+    def _write(self, record):
+        self.file.write(json.dumps(record, ensure_ascii=False))
+        self.file.write('\n')
@@ -0,0 +1,107 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from ..utils.config import SNAPSHOTS_DIR, PROFILE_ARCHIVE_NAME
+from ..utils.logger import setup_logger
+
+logger = setup_logger()
+
+# Profile pages are kept in one append-only archive per output directory:
+#   snapshots/profiles.pages.gz    concatenated gzip members, one per distinct page
+#   snapshots/profiles.index.jsonl one line per saved page: key, name, sha256,
+#                                  offset and length of its member, saved_at
+# Pages with the same content hash share a member, and any page can be read
+# back on its own by seeking to its offset. Concatenated members are still a
+# valid gzip stream, so `zcat` works on the archive as a whole.
+
+def archive_paths(snapshots_dir, name=PROFILE_ARCHIVE_NAME):
+    return os.path.join(snapshots_dir, f"{name}.pages.gz"), os.path.join(snapshots_dir, f"{name}.index.jsonl")
+
+def open_page_archive(snapshots_dir, name=PROFILE_ARCHIVE_NAME):
+    data_path, index_path = archive_paths(snapshots_dir, name)
+    if not os.path.isfile(index_path):
+        return None
+    return PageArchive(data_path, index_path)
+
+class PageArchive:
+    def __init__(self, data_path, index_path):
+        self.data_path = data_path
+        self.index_path = index_path
+        self.lock = threading.Lock()
+        self.entries = {}
+        self.members = {}
+        self._load_index()
+
+    @classmethod
+    def for_output_dir(cls, output_dir, name=PROFILE_ARCHIVE_NAME):
+        data_path, index_path = archive_paths(os.path.join(output_dir, SNAPSHOTS_DIR), name)
+        os.makedirs(os.path.dirname(data_path), exist_ok=True)
+        return cls(data_path, index_path)
+
+    def _load_index(self):
+        if not os.path.isfile(self.index_path):
+            return
+        data_size = os.path.getsize(self.data_path) if os.path.isfile(self.data_path) else 0
+        with open(self.index_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A torn last line from an interrupted run
+                    continue
+                if entry['offset'] + entry['length'] > data_size:
+                    continue
+                self.entries[entry['key']] = entry
+                self.members[entry['sha256']] = (entry['offset'], entry['length'])
+
+    def add(self, key, html, name=None):
+        content = html.encode('utf-8')
+        sha256 = hashlib.sha256(content).hexdigest()
+        with self.lock:
+            member = self.members.get(sha256)
+            if member is None:
+                compressed = gzip.compress(content, compresslevel=6, mtime=0)
+                with open(self.data_path, 'ab') as f:
+                    offset = f.tell()
+                    f.write(compressed)
+                member = (offset, len(compressed))
+                self.members[sha256] = member
+            else:
+                logger.debug(f"Page for {key} is identical to an archived page, not storing it again")
+
+            entry = {
+                'key': key,
+                'name': name,
+                'sha256': sha256,
+                'offset': member[0],
+                'length': member[1],
+                'saved_at': datetime.now().isoformat(timespec='seconds')
+            }
+            with open(self.index_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False))
+                f.write('\n')
+            self.entries[key] = entry
+        return entry
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def keys(self):
+        return list(self.entries)
+
+    def read(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            raise KeyError(key)
+        return self.read_entry(entry)
+
+    def read_entry(self, entry):
+        with open(self.data_path, 'rb') as f:
+            f.seek(entry['offset'])
+            return gzip.decompress(f.read(entry['length'])).decode('utf-8')
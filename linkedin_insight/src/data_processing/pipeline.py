@@ -0,0 +1,125 @@
+import csv
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from .csv_generator import employee_row, photo_filepath_for
+from .image_downloader import HostLimits, create_session, fetch_image
+from .jsonl_stream import CompanyNetworkWriter, data_file_path
+from ..utils.logger import setup_logger, span
+from ..utils.config import (
+    IMAGE_DOWNLOAD_WORKERS, IMAGE_DOWNLOAD_PER_HOST, IMAGE_DOWNLOAD_RETRIES,
+    IMAGE_DOWNLOAD_BACKOFF, IMAGE_DOWNLOAD_TIMEOUT
+)
+
+logger = setup_logger()
+
+_DONE = object()
+
+# Consumes employees from linkedin_scraper while the browser is still visiting
+# profiles. Photos are fetched on a thread pool, and two writer threads append
+# CSV rows (in submission order) and JSON Lines records as employees arrive, so
+# only the pyramids are left once navigation ends. A photo that fails gets the
+# generic image, and a failed writer only costs its own output, which the
+# caller writes again from the scraped data.
+class ScrapePipeline:
+    def __init__(self, company_name, output_dir, max_workers=IMAGE_DOWNLOAD_WORKERS,
+                 per_host=IMAGE_DOWNLOAD_PER_HOST, image_cache=None):
+        self.company_name = company_name
+        self.output_dir = output_dir
+        self.images_dir = os.path.join(output_dir, "images")
+        self.csv_filepath = os.path.join(output_dir, 'employees.csv')
+        self.data_path = data_file_path(output_dir, company_name)
+        self.image_cache = image_cache
+        self.session = create_session(max_workers)
+        self.host_limits = HostLimits(per_host)
+        self.downloads = ThreadPoolExecutor(max_workers=max(1, max_workers))
+        self.rows = queue.Queue()
+        self.records = queue.Queue()
+        self.writer = None
+        self.threads = []
+        self.errors = {}
+        self.employee_count = 0
+
+    def begin(self, company_network):
+        if not os.path.exists(self.images_dir):
+            os.makedirs(self.images_dir)
+        self.writer = CompanyNetworkWriter(self.data_path)
+        self.writer.write_header(company_network.get('company', {}), company_network.get('scraped_at'))
+        for job in company_network.get('job_descriptions', []):
+            self.writer.write_job(job)
+
+        self.threads = [
+            threading.Thread(target=self._run_stage, args=(self._write_rows,), name="pipeline-csv", daemon=True),
+            threading.Thread(target=self._run_stage, args=(self._write_records,), name="pipeline-jsonl", daemon=True),
+        ]
+        for thread in self.threads:
+            thread.start()
+        logger.info(f"Pipeline started for {self.company_name}")
+
+    def add_employee(self, employee):
+        photo_url = employee.get('photo_url')
+        future = self.downloads.submit(
+            fetch_image, self.session, photo_url, photo_filepath_for(self.images_dir, employee), self.host_limits,
+            IMAGE_DOWNLOAD_RETRIES, IMAGE_DOWNLOAD_BACKOFF, IMAGE_DOWNLOAD_TIMEOUT, self.image_cache
+        )
+        self.rows.put((employee, photo_url, future))
+        self.records.put(employee)
+        self.employee_count += 1
+
+    # Returns True when both the CSV and the JSON Lines file were written
+    @span('pipeline.drain')
+    def finish(self):
+        self._stop()
+        if self.writer is None:
+            logger.warning(f"Pipeline for {self.company_name} finished before any company data was received")
+            return False
+        if 'pipeline-jsonl' in self.errors:
+            # Only a partial data file is removed, a CSV or photo failure keeps it
+            self.writer.abort()
+        else:
+            self.writer.close()
+        if self.errors:
+            logger.warning(f"Pipeline for {self.company_name} did not complete {', '.join(self.errors)}, writing it again")
+            return False
+        logger.info(f"Pipeline finished for {self.company_name}: {self.employee_count} employees")
+        return True
+
+    def abort(self):
+        self._stop()
+        if self.writer:
+            self.writer.abort()
+        logger.warning(f"Pipeline aborted for {self.company_name}")
+
+    def _stop(self):
+        self.rows.put(_DONE)
+        self.records.put(_DONE)
+        for thread in self.threads:
+            thread.join()
+        self.downloads.shutdown(wait=True)
+        self.session.close()
+
+    def _run_stage(self, stage):
+        try:
+            stage()
+        except Exception as e:
+            logger.error(f"Pipeline stage {threading.current_thread().name} failed: {str(e)}")
+            self.errors[threading.current_thread().name] = e
+
+    def _write_rows(self):
+        with open(self.csv_filepath, mode='w', newline='', encoding='utf-8') as csv_file:
+            writer = csv.DictWriter(csv_file, fieldnames=['Photo Path', 'First Name', 'Last Name', 'Job Title'])
+            writer.writeheader()
+            for item in iter(self.rows.get, _DONE):
+                employee, photo_url, future = item
+                try:
+                    photo_filepath = future.result()
+                except Exception as e:
+                    logger.warning(f"Photo download failed for {employee.get('name')}: {str(e)}")
+                    photo_filepath = None
+                writer.writerow(employee_row(employee, photo_url, photo_filepath, self.output_dir, self.images_dir, self.image_cache))
+        logger.info(f"CSV file created: {self.csv_filepath}")
+
+    def _write_records(self):
+        for employee in iter(self.records.get, _DONE):
+            self.writer.write_employee(employee)
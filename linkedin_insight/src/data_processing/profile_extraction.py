@@ -0,0 +1,94 @@
+import gzip
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from .employee_record import Employee
+from .incremental import employee_key, PROFILE_FIELDS
+from .page_archive import open_page_archive
+from ..scraper.html_parser import parse_profile
+from ..utils.config import SNAPSHOTS_DIR, PROFILE_EXTRACTION_WORKERS
+from ..utils.logger import setup_logger, span
+
+logger = setup_logger()
+
+# Parses the archived profile pages of a run into location, experience and
+# education and attaches them to the matching employees. Each distinct page is
+# parsed once, in a separate process: workers read and decompress their own
+# archive member, so only offsets go in and small dicts come back.
+
+@span('parse.profiles')
+def extract_profiles(company_network, output_dir, company_name, max_workers=PROFILE_EXTRACTION_WORKERS):
+    archive = open_page_archive(os.path.join(output_dir, SNAPSHOTS_DIR))
+    if archive is None or not len(archive):
+        logger.info(f"No archived profiles in {output_dir}, skipping profile extraction")
+        return None
+
+    members = {}
+    for entry in archive.entries.values():
+        members.setdefault(entry['sha256'], (archive.data_path, entry['offset'], entry['length'], entry['key']))
+
+    started = time.perf_counter()
+    tasks = list(members.items())
+    if max_workers <= 1 or len(tasks) == 1:
+        results = [_parse_member(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(_parse_member, tasks, chunksize=max(1, len(tasks) // (max_workers * 4))))
+    elapsed = time.perf_counter() - started
+
+    profiles = {sha256: profile for sha256, profile, _, _ in results if profile is not None}
+    # New employees are built rather than updated, since the caller's may be read-only records
+    employees = []
+    attached = 0
+    for employee in company_network.get('employees', []):
+        entry = archive.entries.get(employee_key(employee))
+        profile = profiles.get(entry['sha256']) if entry else None
+        if profile is not None:
+            employee = with_profile(employee, {field: profile[field] for field in PROFILE_FIELDS})
+            attached += 1
+        employees.append(employee)
+    company_network['employees'] = employees
+
+    report_path = write_timing_report(results, elapsed, max_workers, output_dir, company_name)
+    logger.info(f"Profile extraction: {attached} of {len(employees)} employees from {len(tasks)} pages in {elapsed:.2f}s with {max_workers} workers")
+    return report_path
+
+def with_profile(employee, fields):
+    if isinstance(employee, Employee):
+        return employee.with_fields(**fields)
+    return {**employee, **fields}
+
+def _parse_member(task):
+    sha256, (data_path, offset, length, key) = task
+    started = time.perf_counter()
+    try:
+        with open(data_path, 'rb') as f:
+            f.seek(offset)
+            html = gzip.decompress(f.read(length))
+        profile = parse_profile(html)
+        return sha256, profile, key, time.perf_counter() - started
+    except Exception as e:
+        logger.warning(f"Unable to extract profile {key}: {str(e)}")
+        return sha256, None, key, time.perf_counter() - started
+
+def write_timing_report(results, elapsed, max_workers, output_dir, company_name):
+    durations = sorted(duration for _, _, _, duration in results)
+    report = {
+        'documents': len(results),
+        'failed': sum(1 for _, profile, _, _ in results if profile is None),
+        'workers': max_workers,
+        'elapsed': round(elapsed, 4),
+        'parse_seconds': round(sum(durations), 4),
+        'p50': round(durations[len(durations) // 2], 6) if durations else None,
+        'p95': round(durations[int(len(durations) * 0.95)], 6) if durations else None,
+        'max': round(durations[-1], 6) if durations else None,
+        'timings': [{'key': key, 'sha256': sha256, 'seconds': round(duration, 6)} for sha256, _, key, duration in results]
+    }
+    report_path = os.path.join(output_dir, f"{company_name}_profile_timings.json")
+    try:
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=4)
+    except Exception as e:
+        logger.error(f"Error saving profile timing report: {str(e)}")
+    return report_path
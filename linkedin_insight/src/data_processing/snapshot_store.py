@@ -0,0 +1,216 @@
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from .employee_record import EmployeeTable
+from .jsonl_stream import find_data_file
+from ..utils.logger import setup_logger
+from ..utils.config import SNAPSHOT_DB_PATH, CACHE_MAX_AGE
+
+logger = setup_logger()
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS companies (
+    id INTEGER PRIMARY KEY,
+    slug TEXT NOT NULL UNIQUE,
+    name TEXT
+);
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY,
+    company_id INTEGER NOT NULL REFERENCES companies (id),
+    created_at REAL NOT NULL,
+    directory TEXT NOT NULL UNIQUE,
+    data_path TEXT,
+    scraped_at TEXT,
+    employee_count INTEGER NOT NULL DEFAULT 0,
+    job_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS snapshots_company_created ON snapshots (company_id, created_at);
+CREATE TABLE IF NOT EXISTS employees (
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    name TEXT,
+    title TEXT,
+    profile_url TEXT,
+    photo_url TEXT,
+    PRIMARY KEY (snapshot_id, position)
+);
+CREATE INDEX IF NOT EXISTS employees_profile_url ON employees (profile_url);
+CREATE TABLE IF NOT EXISTS job_postings (
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    title TEXT,
+    company TEXT,
+    location TEXT,
+    PRIMARY KEY (snapshot_id, position)
+);
+'''
+
+SNAPSHOT_COLUMNS = 's.id, c.slug, s.directory, s.created_at, s.data_path, s.scraped_at, s.employee_count, s.job_count'
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+def open_snapshot_store(path=SNAPSHOT_DB_PATH):
+    with _stores_lock:
+        if path not in _stores:
+            _stores[path] = SnapshotStore(path)
+        return _stores[path]
+
+def find_fresh_snapshot(company_name, max_age=CACHE_MAX_AGE):
+    snapshot = open_snapshot_store().latest_snapshot(company_name, max_age=max_age)
+    return snapshot['directory'] if snapshot else None
+
+def create_company_directory(company_name):
+    today = datetime.today().strftime('%Y-%m-%d')
+    directory_name = f"{company_name}_{today}"
+    if not os.path.exists(directory_name):
+        os.makedirs(directory_name)
+    images_dir = os.path.join(directory_name, "images")
+    if not os.path.exists(images_dir):
+        os.makedirs(images_dir)
+    open_snapshot_store().create_snapshot(company_name, directory_name)
+    return directory_name
+
+def normalize_path(path):
+    # Snapshots are keyed by absolute path, so a directory reached from the
+    # scrape and from --json is indexed once whatever the working directory
+    return os.path.abspath(os.path.normpath(path)) if path else path
+
+def company_name_from_directory(directory):
+    directory_name = os.path.basename(os.path.abspath(directory))
+    name, _, date_str = directory_name.rpartition('_')
+    try:
+        datetime.strptime(date_str, '%Y-%m-%d')
+        return name
+    except ValueError:
+        return directory_name
+
+class SnapshotStore:
+    def __init__(self, path=SNAPSHOT_DB_PATH):
+        self.path = path
+        is_new = not os.path.exists(path)
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.db.execute('PRAGMA foreign_keys = ON')
+        self.db.executescript(SCHEMA)
+        if is_new:
+            self.import_legacy_directories(os.path.dirname(os.path.abspath(path)))
+
+    def close(self):
+        with self.lock:
+            self.db.close()
+
+    def create_snapshot(self, slug, directory, created_at=None):
+        created_at = time.time() if created_at is None else created_at
+        directory = normalize_path(directory)
+        with self.lock, self.db:
+            company_id = self._company_id(slug)
+            self.db.execute(
+                'INSERT OR IGNORE INTO snapshots (company_id, created_at, directory) VALUES (?, ?, ?)',
+                (company_id, created_at, directory)
+            )
+            return self.db.execute('SELECT id FROM snapshots WHERE directory = ?', (directory,)).fetchone()[0]
+
+    def latest_snapshot(self, slug, max_age=None, with_data=False):
+        query = f'''
+            SELECT {SNAPSHOT_COLUMNS} FROM snapshots s JOIN companies c ON c.id = s.company_id
+            WHERE c.slug = ? AND s.created_at >= ?
+        '''
+        if with_data:
+            query += ' AND s.data_path IS NOT NULL'
+        query += ' ORDER BY s.created_at DESC'
+        min_created_at = time.time() - max_age if max_age is not None else 0
+        with self.lock:
+            for row in self.db.execute(query, (slug, min_created_at)):
+                snapshot = self._snapshot(row)
+                if os.path.isdir(snapshot['directory']):
+                    return snapshot
+        return None
+
+    def history(self, slug=None, since=None):
+        query = f'SELECT {SNAPSHOT_COLUMNS} FROM snapshots s JOIN companies c ON c.id = s.company_id WHERE s.created_at >= ?'
+        params = [since or 0]
+        if slug:
+            query += ' AND c.slug = ?'
+            params.append(slug)
+        query += ' ORDER BY c.slug, s.created_at'
+        with self.lock:
+            return [self._snapshot(row) for row in self.db.execute(query, params).fetchall()]
+
+    def save_company_network(self, slug, directory, company_network, data_path):
+        snapshot_id = self.create_snapshot(slug, directory)
+        employee_rows = [
+            (snapshot_id, i, e.get('name'), e.get('title'), e.get('profile_url'), e.get('photo_url'))
+            for i, e in enumerate(company_network.get('employees', []))
+        ]
+        job_rows = [
+            (snapshot_id, i, j.get('title'), j.get('company'), j.get('location'))
+            for i, j in enumerate(company_network.get('job_descriptions', []))
+        ]
+        company_name = (company_network.get('company') or {}).get('name')
+        with self.lock, self.db:
+            if company_name:
+                self.db.execute('UPDATE companies SET name = ? WHERE slug = ?', (company_name, slug))
+            self.db.execute('DELETE FROM employees WHERE snapshot_id = ?', (snapshot_id,))
+            self.db.execute('DELETE FROM job_postings WHERE snapshot_id = ?', (snapshot_id,))
+            self.db.executemany(
+                'INSERT INTO employees (snapshot_id, position, name, title, profile_url, photo_url) VALUES (?, ?, ?, ?, ?, ?)',
+                employee_rows
+            )
+            self.db.executemany(
+                'INSERT INTO job_postings (snapshot_id, position, title, company, location) VALUES (?, ?, ?, ?, ?)',
+                job_rows
+            )
+            self.db.execute(
+                'UPDATE snapshots SET data_path = ?, scraped_at = ?, employee_count = ?, job_count = ? WHERE id = ?',
+                (normalize_path(data_path), company_network.get('scraped_at'), len(employee_rows), len(job_rows), snapshot_id)
+            )
+        logger.info(f"Snapshot {snapshot_id} indexed for {slug}: {len(employee_rows)} employees, {len(job_rows)} job postings")
+        return snapshot_id
+
+    def employees(self, snapshot_id):
+        with self.lock:
+            rows = self.db.execute(
+                'SELECT name, title, profile_url, photo_url FROM employees WHERE snapshot_id = ? ORDER BY position', (snapshot_id,)
+            ).fetchall()
+        return EmployeeTable({'name': r[0], 'title': r[1], 'profile_url': r[2], 'photo_url': r[3]} for r in rows)
+
+    def job_postings(self, snapshot_id):
+        with self.lock:
+            rows = self.db.execute(
+                'SELECT title, company, location FROM job_postings WHERE snapshot_id = ? ORDER BY position', (snapshot_id,)
+            ).fetchall()
+        return [{'title': r[0], 'company': r[1], 'location': r[2]} for r in rows]
+
+    def import_legacy_directories(self, base_path):
+        # One-off migration for directories created before the store existed
+        imported = 0
+        for name in os.listdir(base_path):
+            directory = os.path.join(base_path, name)
+            slug, _, date_str = name.rpartition('_')
+            if not slug or not os.path.isdir(directory):
+                continue
+            try:
+                created_at = datetime.strptime(date_str, '%Y-%m-%d').timestamp()
+            except ValueError:
+                continue
+            snapshot_id = self.create_snapshot(slug, directory, created_at)
+            data_path = find_data_file(directory, slug)
+            if data_path:
+                with self.lock, self.db:
+                    self.db.execute('UPDATE snapshots SET data_path = ? WHERE id = ?', (normalize_path(data_path), snapshot_id))
+            imported += 1
+        if imported:
+            logger.info(f"Imported {imported} existing snapshot directories into {self.path}")
+
+    def _company_id(self, slug):
+        self.db.execute('INSERT OR IGNORE INTO companies (slug) VALUES (?)', (slug,))
+        return self.db.execute('SELECT id FROM companies WHERE slug = ?', (slug,)).fetchone()[0]
+
+    def _snapshot(self, row):
+        return {
+            'id': row[0], 'slug': row[1], 'directory': row[2], 'created_at': row[3], 'data_path': row[4],
+            'scraped_at': row[5], 'employee_count': row[6], 'job_count': row[7]
+        }
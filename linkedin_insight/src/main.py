@@ -1,27 +1,56 @@
 import os
-import json
 from urllib.parse import urlparse
-from datetime import datetime, timedelta
 from dotenv import load_dotenv
-from .scraper.linkedin_scraper import linkedin_scraper
-from .data_processing.csv_generator import write_employees_to_csv
-from .data_processing.json_processor import process_json
-from .visualization.hierarchy_pyramid import create_hierarchy_pyramid
-from .visualization.html_generator import create_html_pyramid
-from .utils.config import get_delay_config, parse_arguments
-from .utils.logger import setup_logger
+from .data_processing.image_cache import open_image_cache
+from .data_processing.incremental import load_previous_snapshot, write_delta
+from .data_processing.jsonl_stream import data_file_path, write_company_network
+from .data_processing.snapshot_store import open_snapshot_store, find_fresh_snapshot, create_company_directory, company_name_from_directory
+from .utils.config import SNAPSHOTS_DIR, get_delay_config
+from .utils.seniority import get_classifier
+from .utils.logger import setup_logger, span, span_recorder
+
+# Selenium, the HTML parsers, requests, graphviz and jinja2 are imported by the
+# stages that use them, so reprocessing a JSON file never loads the browser
+# stack and the package imports without reading the command line.
 
 logger = setup_logger()
 
-def main(args):
+def main(argv=None):
+    load_dotenv()
+    args, delay_config = get_delay_config(argv)
+    try:
+        run(args, delay_config)
+    finally:
+        for name, total in span_recorder.summary().items():
+            logger.info(f"Timing {name}: {total['count']}x, {total['total']:.3f}s total, {total['max']:.3f}s max")
+        if args.timings:
+            span_recorder.write_report(args.timings)
+            logger.info(f"Timing report saved in {args.timings}")
+
+def run(args, delay_config):
     if args.json:
-        json_path = args.json
-        if not os.path.isfile(json_path):
-            print(f"Specified JSON file does not exist: {json_path}")
-            logger.error(f"Specified JSON file does not exist: {json_path}")
-            return
-        company_name_input = os.path.splitext(os.path.basename(json_path))[0].replace('_linkedin_data', '')
-        output_dir = process_json(json_path, company_name_input, args)
+        from .data_processing.json_processor import expand_json_paths, process_json_files
+        json_paths = expand_json_paths(args.json)
+        if json_paths:
+            process_json_files(json_paths, args, max_workers=args.workers)
+        return
+
+    # One photo cache connection is shared by every stage and company of the run
+    image_cache = open_image_cache(args)
+    try:
+        scrape_or_replay(args, delay_config, image_cache)
+    finally:
+        if image_cache is not None:
+            image_cache.close()
+
+def scrape_or_replay(args, delay_config, image_cache):
+    if args.replay:
+        replay_snapshots(args.replay, args, image_cache)
+        return
+
+    if args.batch:
+        from .batch import run_batch
+        run_batch(args.batch, args, delay_config, scrape_company, parse_company_input, image_cache)
         return
 
     company_input = input("Enter the LinkedIn company URL or name: ").strip()
@@ -31,20 +60,65 @@ def main(args):
         print("Invalid LinkedIn company URL. Please enter a valid URL or company name.")
         return
 
-    output_dir = create_or_use_cache(company_name, args.force)
-    
+    logger.info(f"Starting scraping process for company: {company_name}")
+    print("Note: After login, the script will pause to allow you to solve any CAPTCHAs.")
+    print("Press Enter when you are ready to continue after solving the CAPTCHAs.")
+    from .scraper.driver_pool import DriverPool
+    from .scraper.web_driver import driver_factory
+    pool = DriverPool(size=1, profile_root=args.browser_profile_dir, driver_factory=driver_factory(args.lean, args.headed), delay_config=delay_config)
     try:
-        logger.info(f"Starting scraping process for company: {company_name}")
-        print("Note: After login, the script will pause to allow you to solve any CAPTCHAs.")
-        print("Press Enter when you are ready to continue after solving the CAPTCHAs.")
-        company_network = linkedin_scraper(company_url, output_dir)
-        
-        if company_network:
-            save_and_process_data(company_network, company_name, output_dir, args)
-        else:
-            logger.error("Scraping failed.")
+        scrape_company(company_url, company_name, args, pool, delay_config, image_cache)
     except Exception as e:
         logger.critical(f"Critical error during script execution: {str(e)}")
+    finally:
+        pool.close()
+
+def scrape_company(company_url, company_name, args, pool, delay_config, image_cache=None):
+    from .scraper.linkedin_scraper import linkedin_scraper
+    from .data_processing.pipeline import ScrapePipeline
+
+    output_dir = create_or_use_cache(company_name, args.force)
+    previous_network = load_previous_snapshot(company_name) if args.incremental else None
+    pipeline = ScrapePipeline(company_name, output_dir, max_workers=args.download_workers, per_host=args.per_host_downloads, image_cache=image_cache) if args.pipeline else None
+
+    try:
+        with pool.driver() as driver:
+            company_network = linkedin_scraper(company_url, output_dir, previous_network=previous_network, profile_ttl=args.profile_ttl * 24 * 60 * 60, driver=driver, sink=pipeline, max_employees=args.max_employees, max_jobs=args.max_jobs, extraction_mode=args.extraction_mode, delay_config=delay_config)
+    except Exception:
+        if pipeline:
+            pipeline.abort()
+        raise
+
+    if not company_network:
+        if pipeline:
+            pipeline.abort()
+        logger.error("Scraping failed.")
+        return None
+
+    if previous_network:
+        write_delta(previous_network, company_network, company_name, output_dir)
+    streamed = pipeline.finish() if pipeline else False
+    save_and_process_data(company_network, company_name, output_dir, args, streamed=streamed, image_cache=image_cache)
+    return output_dir
+
+def replay_snapshots(directory, args, image_cache=None):
+    if not os.path.isdir(directory):
+        print(f"Specified snapshot directory does not exist: {directory}")
+        logger.error(f"Specified snapshot directory does not exist: {directory}")
+        return
+
+    output_dir = os.path.normpath(directory)
+    if os.path.basename(output_dir) == SNAPSHOTS_DIR:
+        output_dir = os.path.dirname(output_dir) or '.'
+
+    from .scraper.replay import replay_company_network
+    company_network = replay_company_network(output_dir)
+    if not company_network:
+        logger.error(f"Replay failed for {directory}")
+        return
+
+    company_name = company_name_from_directory(output_dir)
+    save_and_process_data(company_network, company_name, output_dir, args, image_cache=image_cache)
 
 def parse_company_input(company_input):
     if company_input.startswith("http://") or company_input.startswith("https://"):
@@ -65,7 +139,7 @@ def extract_company_name_from_url(url):
     return None
 
 def create_or_use_cache(company_name, force):
-    cached_dir = cache_exists(company_name)
+    cached_dir = find_fresh_snapshot(company_name)
     if cached_dir and not force:
         print(f"Using cached data from {cached_dir}")
         return cached_dir
@@ -74,67 +148,44 @@ def create_or_use_cache(company_name, force):
         print(f"Starting a new scan and saving data in {directory}")
         return directory
 
-def cache_exists(company_name):
-    base_path = os.getcwd()
-    company_dirs = [d for d in os.listdir(base_path) if os.path.isdir(d) and company_name in d]
-    for directory in company_dirs:
-        try:
-            dir_date_str = directory.split('_')[-1]
-            dir_date = datetime.strptime(dir_date_str, '%Y-%m-%d')
-            if datetime.now() - dir_date < timedelta(days=3):
-                return directory
-        except ValueError:
-            continue
-    return None
+def save_and_process_data(company_network, company_name, output_dir, args, streamed=False, image_cache=None):
+    # Attach structured profile fields parsed from the archived profile pages
+    if args.extract_profiles:
+        from .data_processing.profile_extraction import extract_profiles
+        extract_profiles(company_network, output_dir, company_name, max_workers=args.profile_workers)
 
-def create_company_directory(company_name):
-    today = datetime.today().strftime('%Y-%m-%d')
-    directory_name = f"{company_name}_{today}"
-    if not os.path.exists(directory_name):
-        os.makedirs(directory_name)
-    images_dir = os.path.join(directory_name, "images")
-    if not os.path.exists(images_dir):
-        os.makedirs(images_dir)
-    return directory_name
-
-def save_and_process_data(company_network, company_name, output_dir, args):
-    # Save JSON data
-    output_file = os.path.join(output_dir, f"{company_name}_linkedin_data.json")
+    # Save JSON Lines data, unless the pipeline already streamed it to disk
+    output_file = data_file_path(output_dir, company_name)
     try:
-        with open(output_file, "w", encoding="utf-8") as f:
-            json.dump(company_network, f, ensure_ascii=False, indent=4)
+        if not streamed or args.extract_profiles:
+            with span('write.jsonl'):
+                write_company_network(company_network, output_file)
         print(f"Data saved in {output_file}")
         logger.info(f"Scraping completed successfully. Data saved in {output_file}")
+        open_snapshot_store().save_company_network(company_name, output_dir, company_network, output_file)
     except Exception as e:
         logger.error(f"Error saving data: {str(e)}")
     
     # Create CSV file
     employees = company_network.get('employees', [])
-    write_employees_to_csv(employees, output_dir)
+    if not streamed:
+        from .data_processing.csv_generator import write_employees_to_csv
+        write_employees_to_csv(employees, output_dir, max_workers=args.download_workers, per_host=args.per_host_downloads, image_cache=image_cache)
+    
+    # Append to the columnar export if requested
+    if args.export:
+        from .data_processing.columnar_export import export_company_network
+        export_company_network(company_network, company_name, output_dir, export_dir=args.export_dir, export_format=args.export_format, classifier=get_classifier(args.seniority_rules))
     
     # Create hierarchy pyramid if requested
     if args.create_pyramid:
-        create_hierarchy_pyramid(employees, company_name, output_dir)
+        from .visualization.hierarchy_pyramid import create_hierarchy_pyramid
+        create_hierarchy_pyramid(employees, company_name, output_dir, classifier=get_classifier(args.seniority_rules), output_format=args.pyramid_format, aggregate_threshold=args.pyramid_threshold)
     
     # Create HTML hierarchy pyramid if requested
     if args.create_html_pyramid:
-        create_html_pyramid(company_network, output_dir)
-    
-    # Delete downloaded HTML files
-    delete_html_files(output_dir)
-
-def delete_html_files(output_dir):
-    for root, dirs, files in os.walk(output_dir):
-        for file in files:
-            if file.endswith(".html"):
-                file_path = os.path.join(root, file)
-                try:
-                    os.remove(file_path)
-                    logger.info(f"HTML file deleted: {file_path}")
-                except Exception as e:
-                    logger.warning(f"Unable to delete HTML file {file_path}: {str(e)}")
+        from .visualization.html_generator import create_html_pyramid
+        create_html_pyramid(company_network, output_dir, classifier=get_classifier(args.seniority_rules), mode=args.html_pyramid_mode)
 
 if __name__ == "__main__":
-    load_dotenv()
-    args, delay_config = get_delay_config()
-    main(args)
\ No newline at end of file
+    main()
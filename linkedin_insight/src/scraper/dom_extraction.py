@@ -0,0 +1,70 @@
+from selenium.common.exceptions import WebDriverException
+from .html_parser import EMPLOYEE_CARD_CLASS, EMPLOYEE_NAME_CLASS, EMPLOYEE_TITLE_CLASS, JOB_CARD_CLASSES
+from ..utils.logger import setup_logger
+
+logger = setup_logger()
+
+# In-browser counterparts of the html_parser functions. Each script runs once
+# per page through execute_script and returns only the card fields as a JSON
+# array, instead of sending the whole page_source over the WebDriver wire.
+# Text is read the way node_text() does: every text node outside script and
+# style stripped, then joined.
+
+TEXT_HELPER = """
+function text(node) {
+    if (!node) { return null; }
+    var walker = document.createTreeWalker(node, NodeFilter.SHOW_TEXT), value = '', current;
+    while ((current = walker.nextNode())) {
+        if (!current.parentElement.closest('script, style')) { value += current.nodeValue.trim(); }
+    }
+    return value;
+}
+function attr(node, name) { return node ? node.getAttribute(name) : null; }
+"""
+
+EMPLOYEE_SCRIPT = TEXT_HELPER + f"""
+var cards = document.querySelectorAll('div.{EMPLOYEE_CARD_CLASS}'), rows = [];
+for (var i = 0; i < cards.length; i++) {{
+    var card = cards[i];
+    rows.push([
+        text(card.querySelector('div.{EMPLOYEE_NAME_CLASS}')),
+        text(card.querySelector('div.{EMPLOYEE_TITLE_CLASS}')),
+        attr(card.querySelector('a.app-aware-link'), 'href'),
+        attr(card.querySelector('img[src]'), 'src')
+    ]);
+}}
+return rows;
+"""
+
+JOB_SCRIPT = TEXT_HELPER + f"""
+var cards = document.querySelectorAll('li{''.join(f".{c}" for c in JOB_CARD_CLASSES)}'), rows = [];
+for (var i = 0; i < cards.length; i++) {{
+    var card = cards[i];
+    rows.push([
+        text(card.querySelector('h3.base-search-card__title')),
+        text(card.querySelector('a.hidden-nested-link')),
+        text(card.querySelector('span.job-search-card__location'))
+    ]);
+}}
+return rows;
+"""
+
+COMPANY_SCRIPT = TEXT_HELPER + """
+return {
+    logo_url: attr(document.querySelector('div.org-top-card-primary-content__logo-container img'), 'src'),
+    name: text(document.querySelector('h1.org-top-card-summary__title')),
+    description: text(document.querySelector('p.org-top-card-summary__tagline'))
+};
+"""
+
+def run_extraction_script(driver, script, expected_type=list):
+    # None means the page source has to be parsed instead: the driver has no
+    # JavaScript engine (the fixture driver) or the script failed
+    try:
+        result = driver.execute_script(script)
+    except WebDriverException as e:
+        logger.warning(f"In-browser extraction failed, falling back to page source: {str(e)}")
+        return None
+    if not isinstance(result, expected_type):
+        return None
+    return result
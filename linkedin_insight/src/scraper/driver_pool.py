@@ -0,0 +1,125 @@
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from selenium.webdriver.support.ui import WebDriverWait
+from .web_driver import setup_driver
+from .linkedin_scraper import ensure_logged_in
+from ..utils.config import BROWSER_PROFILE_DIR, DRIVER_POOL_SIZE, DEFAULT_DELAY_CONFIG
+from ..utils.logger import setup_logger
+
+logger = setup_logger()
+
+# Keeps up to `size` logged-in Chrome instances alive and hands them out to
+# scraping jobs. Each slot owns a persistent user-data directory, so cookies
+# survive restarts and a warm profile usually skips the login form entirely.
+class DriverPool:
+    def __init__(self, size=DRIVER_POOL_SIZE, profile_root=BROWSER_PROFILE_DIR, driver_factory=None, delay_config=DEFAULT_DELAY_CONFIG):
+        self.size = max(1, size)
+        self.profile_root = profile_root
+        self.driver_factory = driver_factory or setup_driver
+        self.delay_config = delay_config
+        # Idle browsers and free slots are guarded by one condition, so a
+        # waiting caller wakes up as soon as either a browser is released or a
+        # discarded browser frees its slot
+        self.condition = threading.Condition()
+        self.idle = []
+        self.free_slots = list(range(self.size))
+        self.slots = {}
+        self.login_lock = threading.Lock()
+        self.closed = False
+
+    def acquire(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            driver, slot = self._wait_for_capacity(deadline)
+            if slot is not None:
+                return self._start(slot)
+            if self._is_alive(driver):
+                return driver
+            logger.warning("Discarding unresponsive browser from pool.")
+            self._discard(driver)
+
+    def release(self, driver, broken=False):
+        if broken or self.closed or not self._is_alive(driver):
+            self._discard(driver)
+        else:
+            with self.condition:
+                self.idle.append(driver)
+                self.condition.notify()
+
+    @contextmanager
+    def driver(self, timeout=None):
+        driver = self.acquire(timeout)
+        broken = False
+        try:
+            yield driver
+        except Exception:
+            broken = True
+            raise
+        finally:
+            self.release(driver, broken=broken)
+
+    def close(self):
+        with self.condition:
+            self.closed = True
+            drivers, self.idle = self.idle, []
+            self.condition.notify_all()
+        for driver in drivers:
+            self._discard(driver)
+
+    def _wait_for_capacity(self, deadline):
+        # Returns an idle browser, or a free slot to start one in
+        with self.condition:
+            while True:
+                if self.closed:
+                    raise RuntimeError("Driver pool is closed")
+                if self.idle:
+                    return self.idle.pop(), None
+                if self.free_slots:
+                    return None, self.free_slots.pop(0)
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise queue.Empty
+                self.condition.wait(remaining)
+
+    def _start(self, slot):
+        user_data_dir = os.path.join(self.profile_root, f"profile-{slot}")
+        os.makedirs(user_data_dir, exist_ok=True)
+        driver = None
+        try:
+            driver = self.driver_factory(user_data_dir=user_data_dir)
+            self.slots[id(driver)] = slot
+            # Logins are serialized so only one CAPTCHA prompt is ever waiting for input
+            with self.login_lock:
+                ensure_logged_in(driver, WebDriverWait(driver, 30), self.delay_config)
+        except Exception:
+            if driver is not None:
+                self._discard(driver)
+            else:
+                self._free_slot(slot)
+            raise
+        logger.info(f"Browser {slot} ready (profile: {user_data_dir})")
+        return driver
+
+    def _discard(self, driver):
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.debug(f"Error closing browser: {str(e)}")
+        slot = self.slots.pop(id(driver), None)
+        if slot is not None:
+            self._free_slot(slot)
+
+    def _free_slot(self, slot):
+        with self.condition:
+            self.free_slots.append(slot)
+            self.condition.notify()
+
+    def _is_alive(self, driver):
+        try:
+            driver.current_url
+            return True
+        except Exception:
+            return False
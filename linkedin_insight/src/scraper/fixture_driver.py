@@ -0,0 +1,102 @@
+import os
+import time
+from urllib.parse import urlsplit
+from lxml import html as lxml_html
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.common.by import By
+from .replay import resolve_snapshot_dir
+from ..data_processing.incremental import employee_key
+from ..data_processing.page_archive import open_page_archive
+
+# Stand-in for a Chrome WebDriver that serves local HTML files, so the scraper
+# and everything downstream can run without a browser or network. Pages are
+# looked up in a directory laid out like a saved snapshots folder: company.html,
+# people.html, jobs.html and profiles/<profile-id>.html (or profile.html as a
+# catch-all for every profile), plus feed.html/login.html for session checks.
+# Profiles recorded in the folder's profile archive are served from there first.
+
+def fixture_name(url):
+    parts = [p for p in urlsplit(url).path.split('/') if p]
+    if 'in' in parts:
+        profile_index = parts.index('in') + 1
+        return os.path.join('profiles', f"{parts[profile_index]}.html") if profile_index < len(parts) else 'profile.html'
+    if parts and parts[-1] in ('people', 'jobs', 'login', 'feed'):
+        return f"{parts[-1]}.html"
+    return 'company.html'
+
+class FixtureDriver:
+    def __init__(self, fixture_dir, page_load_delay=0):
+        self.fixture_dir = resolve_snapshot_dir(fixture_dir)
+        self.page_load_delay = page_load_delay
+        self.current_url = None
+        self.page_source = "<html><body></body></html>"
+        self.visited = []
+        self._document = None
+        self.profile_archive = open_page_archive(self.fixture_dir)
+
+    def get(self, url):
+        self.current_url = url
+        self.visited.append(url)
+        self._document = None
+        profile_key = employee_key({'profile_url': url})
+        if self.profile_archive is not None and profile_key in self.profile_archive:
+            self.page_source = self.profile_archive.read(profile_key)
+            return
+
+        filepath = os.path.join(self.fixture_dir, fixture_name(url))
+        if not os.path.isfile(filepath) and filepath.startswith(os.path.join(self.fixture_dir, 'profiles')):
+            filepath = os.path.join(self.fixture_dir, 'profile.html')
+        if os.path.isfile(filepath):
+            with open(filepath, 'r', encoding='utf-8') as f:
+                self.page_source = f.read()
+        else:
+            self.page_source = "<html><body></body></html>"
+        if self.page_load_delay:
+            time.sleep(self.page_load_delay)
+
+    def find_element(self, by=By.ID, value=None):
+        elements = self.find_elements(by, value)
+        if not elements:
+            raise NoSuchElementException(f"{by}={value}")
+        return elements[0]
+
+    def find_elements(self, by=By.ID, value=None):
+        if self._document is None:
+            self._document = lxml_html.document_fromstring(self.page_source or "<html></html>")
+        if by == By.ID:
+            xpath = f"//*[@id='{value}']"
+        elif by == By.XPATH:
+            xpath = value
+        elif by == By.CSS_SELECTOR:
+            # Simple compound selectors only: tag, .class or tag.class.class
+            tag, *classes = value.split('.')
+            xpath = f"//{tag or '*'}" + ''.join(f"[contains(concat(' ', normalize-space(@class), ' '), ' {c} ')]" for c in classes)
+        elif by == By.TAG_NAME:
+            xpath = f"//{value}"
+        else:
+            raise NotImplementedError(f"Unsupported locator strategy: {by}")
+        return [FixtureElement(node) for node in self._document.xpath(xpath)]
+
+    def execute_script(self, script, *args):
+        return None
+
+    def execute_cdp_cmd(self, cmd, params):
+        return {}
+
+    def quit(self):
+        pass
+
+class FixtureElement:
+    def __init__(self, node):
+        self.node = node
+        self.tag_name = node.tag
+        self.text = node.text_content().strip()
+
+    def get_attribute(self, name):
+        return self.node.get(name)
+
+    def click(self):
+        pass
+
+    def send_keys(self, *values):
+        pass
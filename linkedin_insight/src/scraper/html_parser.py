@@ -0,0 +1,198 @@
+import os
+from urllib.parse import urljoin
+from bs4 import BeautifulSoup
+from lxml import etree, html as lxml_html
+from ..utils.logger import setup_logger
+
+logger = setup_logger()
+
+MAX_PATH_LENGTH = 4096
+
+def load_html(source):
+    if isinstance(source, bytes):
+        return source
+    if isinstance(source, os.PathLike) or (isinstance(source, str) and len(source) < MAX_PATH_LENGTH and os.path.isfile(source)):
+        with open(source, 'rb') as f:
+            return f.read()
+    return source
+
+def parse_company_details(source):
+    soup = BeautifulSoup(load_html(source), "lxml")
+
+    company_details = {}
+
+    try:
+        logo_container = soup.find("div", {"class": "org-top-card-primary-content__logo-container"})
+        logo_img = logo_container.find("img") if logo_container else None
+        company_details["logo_url"] = logo_img['src'] if logo_img and 'src' in logo_img.attrs else None
+    except AttributeError:
+        logger.warning("Company logo not found.")
+        company_details["logo_url"] = None
+
+    try:
+        company_details["name"] = soup.find("h1", {"class": "org-top-card-summary__title"}).get_text(strip=True)
+    except AttributeError:
+        logger.warning("Company name not found.")
+        company_details["name"] = None
+
+    try:
+        company_details["description"] = soup.find("p", {"class": "org-top-card-summary__tagline"}).get_text(strip=True)
+    except AttributeError:
+        logger.warning("Company description not found.")
+        company_details["description"] = None
+
+    return company_details
+
+def parse_employees(source):
+    employee_containers = EMPLOYEE_CARD_XPATH(parse_document(source))
+
+    if not employee_containers:
+        logger.warning("No employees found. Please check the CSS selector.")
+
+    rows = []
+    for card in employee_containers:
+        fields = {"name": None, "title": None, "profile_url": None, "photo_url": None}
+        for node in EMPLOYEE_FIELDS_XPATH(card):
+            field = _employee_field(node)
+            if fields[field] is not None:
+                continue
+            if field == 'profile_url':
+                fields[field] = node.get('href')
+            elif field == 'photo_url':
+                fields[field] = node.get('src')
+            else:
+                fields[field] = node_text(node)
+        rows.append((fields["name"], fields["title"], fields["profile_url"], fields["photo_url"]))
+
+    return employees_from_rows(rows)
+
+def parse_job_descriptions(source):
+    job_cards = JOB_CARD_XPATH(parse_document(source))
+
+    if not job_cards:
+        logger.warning("No job listings found. Please check the CSS selector.")
+
+    rows = []
+    for card in job_cards:
+        fields = {"title": None, "company": None, "location": None}
+        for node in JOB_FIELDS_XPATH(card):
+            field = JOB_FIELD_BY_TAG[node.tag]
+            if fields[field] is None:
+                fields[field] = node_text(node)
+        rows.append((fields["title"], fields["company"], fields["location"]))
+
+    return jobs_from_rows(rows)
+
+# Card fields arrive as (name, title, href, src) and (title, company, location)
+# rows, from the XPath parsers above or from the in-browser extraction scripts
+
+def employees_from_rows(rows):
+    employees = []
+    for name, title, href, src in rows:
+        employee = {
+            "name": name,
+            "title": title,
+            "profile_url": urljoin("https://www.linkedin.com", href) if href is not None else None,
+            "photo_url": src
+        }
+        if employee["name"] or employee["title"] or employee["profile_url"]:
+            employees.append(employee)
+    return employees
+
+def jobs_from_rows(rows):
+    job_descriptions = []
+    for title, company, location in rows:
+        job = {"title": title, "company": company, "location": location}
+        if job["title"] or job["location"]:
+            job_descriptions.append(job)
+    return job_descriptions
+
+def parse_profile(source):
+    document = parse_document(source)
+    location = PROFILE_LOCATION_XPATH(document)
+    profile = {"location": node_text(location[0]) if location else None, "experience": [], "education": []}
+
+    for item in EXPERIENCE_ITEMS_XPATH(document):
+        texts = _visible_texts(item)
+        if texts:
+            profile["experience"].append({
+                "title": texts[0],
+                "company": texts[1].split(' · ')[0] if len(texts) > 1 else None,
+                "date_range": texts[2] if len(texts) > 2 else None
+            })
+
+    for item in EDUCATION_ITEMS_XPATH(document):
+        texts = _visible_texts(item)
+        if texts:
+            profile["education"].append({
+                "school": texts[0],
+                "degree": texts[1] if len(texts) > 1 else None,
+                "date_range": texts[2] if len(texts) > 2 else None
+            })
+
+    return profile
+
+def parse_document(source):
+    html = load_html(source)
+    if isinstance(html, bytes):
+        html = html.decode('utf-8', errors='replace')
+    try:
+        return lxml_html.document_fromstring(html)
+    except (etree.ParserError, ValueError) as e:
+        logger.warning(f"Unable to parse HTML document: {str(e)}")
+        return lxml_html.document_fromstring("<html></html>")
+
+def node_text(node):
+    return ''.join(text.strip() for text in NODE_TEXT_XPATH(node))
+
+def _has_class(class_name):
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')"
+
+def _visible_texts(item):
+    return [text for text in (node_text(node) for node in PROFILE_ITEM_TEXT_XPATH(item)) if text]
+
+def _employee_field(node):
+    if node.tag == 'a':
+        return 'profile_url'
+    if node.tag == 'img':
+        return 'photo_url'
+    if EMPLOYEE_NAME_CLASS in node.classes:
+        return 'name'
+    return 'title'
+
+EMPLOYEE_CARD_CLASS = 'org-people-profile-card__profile-info'
+EMPLOYEE_NAME_CLASS = 'org-people-profile-card__profile-title'
+EMPLOYEE_TITLE_CLASS = 'lt-line-clamp--multi-line'
+
+# Selectors are compiled once at import. Each card is located by a single
+# document query, then all of its fields come back from one union query over
+# the card's own subtree, in document order, so the first match per field wins.
+EMPLOYEE_CARD_XPATH = etree.XPath(f"//div[{_has_class(EMPLOYEE_CARD_CLASS)}]")
+EMPLOYEE_FIELDS_XPATH = etree.XPath(' | '.join([
+    f".//div[{_has_class(EMPLOYEE_NAME_CLASS)}]",
+    f".//div[{_has_class(EMPLOYEE_TITLE_CLASS)}]",
+    f".//a[{_has_class('app-aware-link')}]",
+    ".//img[@src]",
+]))
+
+JOB_CARD_CLASSES = ('result-card', 'job-result-card')
+
+JOB_CARD_XPATH = etree.XPath(f"//li[{' and '.join(_has_class(c) for c in JOB_CARD_CLASSES)}]")
+JOB_FIELDS_XPATH = etree.XPath(' | '.join([
+    f".//h3[{_has_class('base-search-card__title')}]",
+    f".//a[{_has_class('hidden-nested-link')}]",
+    f".//span[{_has_class('job-search-card__location')}]",
+]))
+JOB_FIELD_BY_TAG = {'h3': 'title', 'a': 'company', 'span': 'location'}
+
+# Profile sections are found through their anchor div (id="experience",
+# id="education"). Only top-level list items are read, so roles grouped under
+# one company are not listed twice, and each line is read from its
+# aria-hidden copy to skip the screen-reader duplicate.
+PROFILE_ITEM_CLASS = 'artdeco-list__item'
+PROFILE_LOCATION_XPATH = etree.XPath(f"//span[contains(@class, 'break-words')][{_has_class('text-body-small')} and {_has_class('t-black--light')} and {_has_class('break-words')}]")
+EXPERIENCE_ITEMS_XPATH = etree.XPath(f"//section[.//div[@id='experience']]//li[{_has_class(PROFILE_ITEM_CLASS)} and not(ancestor::li[{_has_class(PROFILE_ITEM_CLASS)}])]")
+EDUCATION_ITEMS_XPATH = etree.XPath(f"//section[.//div[@id='education']]//li[{_has_class(PROFILE_ITEM_CLASS)} and not(ancestor::li[{_has_class(PROFILE_ITEM_CLASS)}])]")
+PROFILE_ITEM_TEXT_XPATH = etree.XPath(".//span[@aria-hidden='true']")
+# Text of a node without inline script or style, which itertext() would include
+NODE_TEXT_XPATH = etree.XPath('.//text()[not(ancestor::script or ancestor::style)]')
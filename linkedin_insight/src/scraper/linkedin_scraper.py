@@ -1,43 +1,68 @@
 import os
 import time
 import random
-import json
-from urllib.parse import urljoin
+from datetime import datetime
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
-from bs4 import BeautifulSoup
 from .web_driver import setup_driver
-from ..utils.config import LINKEDIN_USERNAME, LINKEDIN_PASSWORD, get_delay_config
-from ..utils.logger import setup_logger
+from .html_parser import (
+    parse_company_details, parse_employees, parse_job_descriptions, employees_from_rows, jobs_from_rows,
+    EMPLOYEE_CARD_CLASS, JOB_CARD_CLASSES
+)
+from .dom_extraction import run_extraction_script, EMPLOYEE_SCRIPT, JOB_SCRIPT, COMPANY_SCRIPT
+from ..data_processing.incremental import carry_forward_profiles, employee_key
+from ..data_processing.page_archive import PageArchive
+from ..utils.config import (
+    LINKEDIN_USERNAME, LINKEDIN_PASSWORD, SNAPSHOTS_DIR, PROFILE_TTL, SCROLL_POLL_INTERVAL, MAX_SCROLLS,
+    MAX_EMPLOYEE_CARDS, MAX_JOB_CARDS, EXTRACTION_MODE, DEFAULT_DELAY_CONFIG
+)
+from ..utils.logger import setup_logger, span
 
 logger = setup_logger()
-_, delay_config = get_delay_config()
 
-def linkedin_scraper(company_url, output_dir):
-    driver = setup_driver()
+def linkedin_scraper(company_url, output_dir, previous_network=None, profile_ttl=PROFILE_TTL, driver=None, sink=None,
+                     max_employees=MAX_EMPLOYEE_CARDS, max_jobs=MAX_JOB_CARDS, extraction_mode=EXTRACTION_MODE,
+                     delay_config=DEFAULT_DELAY_CONFIG):
+    # A driver passed in by the caller is assumed to be logged in already and is left open
+    owns_driver = driver is None
+    if owns_driver:
+        driver = setup_driver()
     wait = WebDriverWait(driver, 30)
     company_network = {}
 
     try:
-        login_to_linkedin(driver, wait)
-        navigate_to_company_page(driver, company_url, wait)
-        company_details = extract_company_details(driver)
-        employees = extract_employees(driver, company_url, output_dir)
-        job_descriptions = extract_job_descriptions(driver, company_url, output_dir)
+        if owns_driver:
+            login_to_linkedin(driver, wait, delay_config)
+        navigate_to_company_page(driver, company_url, wait, delay_config)
+        company_details = extract_company_details(driver, output_dir, extraction_mode)
+        employees = extract_employees(driver, company_url, output_dir, max_employees, extraction_mode, delay_config)
+        job_descriptions = extract_job_descriptions(driver, company_url, output_dir, max_jobs, extraction_mode, delay_config)
 
         company_network = {
             "company": company_details,
             "employees": employees,
-            "job_descriptions": job_descriptions
+            "job_descriptions": job_descriptions,
+            "scraped_at": datetime.now().isoformat(timespec='seconds')
         }
 
+        skip_keys = carry_forward_profiles(previous_network, employees, profile_ttl) if previous_network else set()
+
+        profile_archive = PageArchive.for_output_dir(output_dir)
+        if sink:
+            sink.begin(company_network)
+
         for employee in employees:
             profile_url = employee.get("profile_url")
             employee_name = employee.get("name")
             if profile_url and employee_name:
-                navigate_and_save_profile(driver, profile_url, company_details['name'], employee_name, output_dir)
+                if employee_key(employee) in skip_keys:
+                    logger.debug(f"Skipping unchanged profile: {profile_url}")
+                elif navigate_and_save_profile(driver, profile_url, employee, profile_archive, delay_config):
+                    employee["profile_saved_at"] = datetime.now().isoformat(timespec='seconds')
+            if sink:
+                sink.add_employee(employee)
 
         return company_network
 
@@ -45,18 +70,20 @@ def linkedin_scraper(company_url, output_dir):
         logger.error(f"An error occurred during scraping: {str(e)}")
         return None
     finally:
-        driver.quit()
+        if owns_driver:
+            driver.quit()
 
-def login_to_linkedin(driver, wait):
+@span('login')
+def login_to_linkedin(driver, wait, delay_config=DEFAULT_DELAY_CONFIG):
     logger.info("Navigating to LinkedIn login page.")
     driver.get("https://www.linkedin.com/login")
-    human_delay(action_type='navigation')
+    human_delay(action_type='navigation', delay_config=delay_config)
 
     try:
         cookie_accept_button = wait.until(EC.element_to_be_clickable((By.XPATH, "//button[contains(@data-control-name, 'accept_cookies')]")))
         cookie_accept_button.click()
         logger.info("Cookie consent accepted.")
-        human_delay(action_type='navigation')
+        human_delay(action_type='navigation', delay_config=delay_config)
     except TimeoutException:
         logger.info("No cookie consent dialog found.")
 
@@ -69,11 +96,11 @@ def login_to_linkedin(driver, wait):
         raise Exception("Login elements not found")
 
     username_field.send_keys(LINKEDIN_USERNAME)
-    human_delay(action_type='login')
+    human_delay(action_type='login', delay_config=delay_config)
     password_field.send_keys(LINKEDIN_PASSWORD)
-    human_delay(action_type='login')
+    human_delay(action_type='login', delay_config=delay_config)
     login_button.click()
-    human_delay(action_type='login')
+    human_delay(action_type='login', delay_config=delay_config)
 
     # Pause to allow user to solve any CAPTCHA
     input("If there are CAPTCHAs to solve, please resolve them now. Press Enter when ready to continue...")
@@ -87,10 +114,20 @@ def login_to_linkedin(driver, wait):
         logger.error("Login failed. Check credentials or presence of additional CAPTCHAs.")
         raise Exception("Login failed")
 
-def navigate_to_company_page(driver, company_url, wait):
+def ensure_logged_in(driver, wait, delay_config=DEFAULT_DELAY_CONFIG):
+    logger.info("Checking for an existing LinkedIn session.")
+    driver.get("https://www.linkedin.com/feed/")
+    try:
+        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, "global-nav")))
+        logger.info("Reusing existing LinkedIn session.")
+    except TimeoutException:
+        login_to_linkedin(driver, wait, delay_config)
+
+@span('navigation.company')
+def navigate_to_company_page(driver, company_url, wait, delay_config=DEFAULT_DELAY_CONFIG):
     logger.info(f"Navigating to company page: {company_url}")
     driver.get(company_url)
-    human_delay(action_type='navigation')
+    human_delay(action_type='navigation', delay_config=delay_config)
 
     try:
         wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, ".org-top-card-summary-info-list")))
@@ -100,124 +137,110 @@ def navigate_to_company_page(driver, company_url, wait):
         raise Exception("Company page not found")
 
     driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-    human_delay(action_type='navigation')
+    human_delay(action_type='navigation', delay_config=delay_config)
 
-def extract_company_details(driver):
-    page_source = driver.page_source
-    soup = BeautifulSoup(page_source, "lxml")
-    
-    company_details = {}
-    
-    try:
-        logo_container = soup.find("div", {"class": "org-top-card-primary-content__logo-container"})
-        logo_img = logo_container.find("img") if logo_container else None
-        company_details["logo_url"] = logo_img['src'] if logo_img and 'src' in logo_img.attrs else None
-    except AttributeError:
-        logger.warning("Company logo not found.")
-        company_details["logo_url"] = None
+def extract_company_details(driver, output_dir, extraction_mode=EXTRACTION_MODE):
+    with span('parse.company'):
+        if extraction_mode == 'script':
+            company_details = run_extraction_script(driver, COMPANY_SCRIPT, dict)
+            if company_details is not None:
+                return company_details
 
-    try:
-        company_details["name"] = soup.find("h1", {"class": "org-top-card-summary__title"}).get_text(strip=True)
-    except AttributeError:
-        logger.warning("Company name not found.")
-        company_details["name"] = None
-
-    try:
-        company_details["description"] = soup.find("p", {"class": "org-top-card-summary__tagline"}).get_text(strip=True)
-    except AttributeError:
-        logger.warning("Company description not found.")
-        company_details["description"] = None
+        page_source = driver.page_source
+        save_snapshot(page_source, 'company', output_dir)
+        return parse_company_details(page_source)
 
-    return company_details
-
-def extract_employees(driver, company_url, output_dir):
-    employees = []
+def extract_employees(driver, company_url, output_dir, max_cards=MAX_EMPLOYEE_CARDS, extraction_mode=EXTRACTION_MODE,
+                      delay_config=DEFAULT_DELAY_CONFIG):
     employees_url = f"{company_url.rstrip('/')}/people/"
 
     logger.info(f"Navigating to employees page: {employees_url}")
-    driver.get(employees_url)
-    human_delay(action_type='navigation')
-
-    for _ in range(5):
-        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        human_delay(action_type='navigation')
-
-    soup = BeautifulSoup(driver.page_source, "lxml")
-    employee_containers = soup.find_all("div", {"class": "org-people-profile-card__profile-info"})
-
-    if not employee_containers:
-        logger.warning("No employees found. Please check the CSS selector.")
-
-    for card in employee_containers:
-        employee = {}
-        try:
-            name_tag = card.find("div", {"class": "org-people-profile-card__profile-title"})
-            title_tag = card.find("div", {"class": "lt-line-clamp--multi-line"})
-            profile_tag = card.find("a", {"class": "app-aware-link"})
-            img_tag = card.find("img", {"src": True})
-
-            employee["name"] = name_tag.get_text(strip=True) if name_tag else None
-            employee["title"] = title_tag.get_text(strip=True) if title_tag else None
-            employee["profile_url"] = urljoin("https://www.linkedin.com", profile_tag['href']) if profile_tag and 'href' in profile_tag.attrs else None
-            employee["photo_url"] = img_tag['src'] if img_tag and 'src' in img_tag.attrs else None
-
-            if employee["name"] or employee["title"] or employee["profile_url"]:
-                employees.append(employee)
-        except AttributeError as e:
-            logger.warning(f"Error extracting employee data: {str(e)}")
-
-    return employees
-
-def extract_job_descriptions(driver, company_url, output_dir):
-    job_descriptions = []
+    with span('navigation.people'):
+        driver.get(employees_url)
+        human_delay(action_type='navigation', delay_config=delay_config)
+        scroll_until_loaded(driver, f".{EMPLOYEE_CARD_CLASS}", max_cards, delay_config)
+
+    with span('parse.people'):
+        if extraction_mode == 'script':
+            rows = run_extraction_script(driver, EMPLOYEE_SCRIPT)
+            if rows is not None:
+                return employees_from_rows(rows)[:max_cards]
+
+        page_source = driver.page_source
+        save_snapshot(page_source, 'people', output_dir)
+        # The last scroll can load more cards than asked for, and each one costs a profile visit
+        return parse_employees(page_source)[:max_cards]
+
+def extract_job_descriptions(driver, company_url, output_dir, max_cards=MAX_JOB_CARDS, extraction_mode=EXTRACTION_MODE,
+                             delay_config=DEFAULT_DELAY_CONFIG):
     jobs_url = f"{company_url.rstrip('/')}/jobs/"
 
     logger.info(f"Navigating to jobs page: {jobs_url}")
-    driver.get(jobs_url)
-    human_delay(action_type='navigation')
-
-    for _ in range(3):
-        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        human_delay(action_type='navigation')
-
-    soup = BeautifulSoup(driver.page_source, "lxml")
-    job_cards = soup.find_all("li", {"class": "result-card job-result-card"})
-
-    if not job_cards:
-        logger.warning("No job listings found. Please check the CSS selector.")
-
-    for card in job_cards:
-        job = {}
-        try:
-            title_tag = card.find("h3", {"class": "base-search-card__title"})
-            company_tag = card.find("a", {"class": "hidden-nested-link"})
-            location_tag = card.find("span", {"class": "job-search-card__location"})
-            job["title"] = title_tag.get_text(strip=True) if title_tag else None
-            job["company"] = company_tag.get_text(strip=True) if company_tag else None
-            job["location"] = location_tag.get_text(strip=True) if location_tag else None
-            if job["title"] or job["location"]:
-                job_descriptions.append(job)
-        except AttributeError as e:
-            logger.warning(f"Error extracting job data: {str(e)}")
-
-    return job_descriptions
-
-def navigate_and_save_profile(driver, profile_url, company_name, employee_name, output_dir):
+    with span('navigation.jobs'):
+        driver.get(jobs_url)
+        human_delay(action_type='navigation', delay_config=delay_config)
+        scroll_until_loaded(driver, 'li' + ''.join(f".{c}" for c in JOB_CARD_CLASSES), max_cards, delay_config)
+
+    with span('parse.jobs'):
+        if extraction_mode == 'script':
+            rows = run_extraction_script(driver, JOB_SCRIPT)
+            if rows is not None:
+                return jobs_from_rows(rows)[:max_cards]
+
+        page_source = driver.page_source
+        save_snapshot(page_source, 'jobs', output_dir)
+        return parse_job_descriptions(page_source)[:max_cards]
+
+@span('navigation.profile')
+def navigate_and_save_profile(driver, profile_url, employee, profile_archive, delay_config=DEFAULT_DELAY_CONFIG):
     try:
         logger.info(f"Navigating to profile: {profile_url}")
         driver.get(profile_url)
-        human_delay(action_type='profile')
+        human_delay(action_type='profile', delay_config=delay_config)
         
         WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.CSS_SELECTOR, "body")))
         
-        sanitized_name = ''.join(c if c.isalnum() else '_' for c in employee_name)
-        save_html(driver, f"{company_name}_profile_{sanitized_name}", output_dir)
+        profile_archive.add(employee_key(employee), driver.page_source, name=employee.get("name"))
+        logger.info(f"Profile archived: {profile_url}")
+        return True
     except TimeoutException:
         logger.error(f"Timeout loading profile: {profile_url}")
     except Exception as e:
         logger.error(f"Error navigating to profile {profile_url}: {str(e)}")
-
-def human_delay(action_type='default'):
+    return False
+
+def scroll_until_loaded(driver, card_selector, max_cards, delay_config=DEFAULT_DELAY_CONFIG, idle_timeout=None):
+    # Scrolls while new cards keep appearing: after each scroll the card count is
+    # polled until it grows or idle_timeout passes without growth, so short
+    # lists finish after one idle wait and long ones load up to max_cards.
+    idle_timeout = delay_config.scroll_idle_timeout if idle_timeout is None else idle_timeout
+    count = count_cards(driver, card_selector)
+    scrolls = 0
+    while count < max_cards and scrolls < MAX_SCROLLS:
+        driver.execute_script(SCROLL_SCRIPT)
+        scrolls += 1
+        human_delay(action_type='scroll', delay_config=delay_config)
+
+        deadline = time.monotonic() + idle_timeout
+        new_count = count_cards(driver, card_selector)
+        while new_count <= count and time.monotonic() < deadline:
+            time.sleep(SCROLL_POLL_INTERVAL)
+            new_count = count_cards(driver, card_selector)
+        if new_count <= count:
+            break
+        count = new_count
+
+    logger.info(f"Loaded {count} cards matching {card_selector} after {scrolls} scrolls")
+    return count
+
+def count_cards(driver, card_selector):
+    count = driver.execute_script("return document.querySelectorAll(arguments[0]).length;", card_selector)
+    if count is None:
+        # Drivers without a JavaScript engine, such as the fixture driver
+        count = len(driver.find_elements(By.CSS_SELECTOR, card_selector))
+    return count
+
+def human_delay(action_type='default', delay_config=DEFAULT_DELAY_CONFIG):
     if not delay_config.enabled:
         return
     
@@ -225,6 +248,7 @@ def human_delay(action_type='default'):
         'login': delay_config.login,
         'navigation': delay_config.navigation,
         'profile': delay_config.profile,
+        'scroll': delay_config.scroll,
         'default': (1, 3)
     }
     delay = random.uniform(*delay_map.get(action_type, delay_map['default']))
@@ -238,9 +262,19 @@ def safe_find_element(driver, by, value, timeout=10):
         logger.warning(f"Element not found: {by}={value}")
         return None
 
-def save_html(driver, filename, output_dir):
-    html = driver.page_source
-    filepath = os.path.join(output_dir, f"{filename}_{int(time.time())}.html")
+def save_snapshot(html, page, output_dir):
+    snapshots_dir = os.path.join(output_dir, SNAPSHOTS_DIR)
+    if not os.path.exists(snapshots_dir):
+        os.makedirs(snapshots_dir)
+    filepath = os.path.join(snapshots_dir, f"{page}.html")
     with open(filepath, 'w', encoding='utf-8') as f:
         f.write(html)
-    logger.info(f"HTML saved: {filepath}")
\ No newline at end of file
+    logger.info(f"Snapshot saved: {filepath}")
+
+# Scrolls to the bottom and presses the "Show more results" button that
+# LinkedIn puts at the end of long lists, if there is one
+SCROLL_SCRIPT = """
+window.scrollTo(0, document.body.scrollHeight);
+var button = document.querySelector('button.scaffold-finite-scroll__load-button');
+if (button && !button.disabled) { button.click(); }
+"""
@@ -0,0 +1,38 @@
+import os
+from .html_parser import parse_company_details, parse_employees, parse_job_descriptions
+from ..utils.config import SNAPSHOTS_DIR
+from ..utils.logger import setup_logger, span
+
+logger = setup_logger()
+
+def resolve_snapshot_dir(directory):
+    nested_dir = os.path.join(directory, SNAPSHOTS_DIR)
+    if os.path.isdir(nested_dir):
+        return nested_dir
+    return directory
+
+@span('parse.replay')
+def replay_company_network(directory):
+    snapshot_dir = resolve_snapshot_dir(directory)
+    pages = {}
+    for page in ('company', 'people', 'jobs'):
+        filepath = os.path.join(snapshot_dir, f"{page}.html")
+        if os.path.isfile(filepath):
+            pages[page] = filepath
+        else:
+            logger.warning(f"Snapshot not found: {filepath}")
+
+    if 'company' not in pages and 'people' not in pages:
+        logger.error(f"No page snapshots found in {snapshot_dir}")
+        return None
+
+    company_details = parse_company_details(pages['company']) if 'company' in pages else {"logo_url": None, "name": None, "description": None}
+    employees = parse_employees(pages['people']) if 'people' in pages else []
+    job_descriptions = parse_job_descriptions(pages['jobs']) if 'jobs' in pages else []
+
+    logger.info(f"Replayed {len(employees)} employees and {len(job_descriptions)} job listings from {snapshot_dir}")
+    return {
+        "company": company_details,
+        "employees": employees,
+        "job_descriptions": job_descriptions
+    }
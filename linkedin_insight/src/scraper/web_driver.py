@@ -1,15 +1,81 @@
+import os
+import random
+from functools import lru_cache, partial
 from selenium import webdriver
+from selenium.common.exceptions import SessionNotCreatedException
 from selenium.webdriver.chrome.service import Service as ChromeService
 from webdriver_manager.chrome import ChromeDriverManager
-import random
+from ..utils.config import CHROMEDRIVER_PATH_CACHE, LEAN_BLOCKED_URLS
+from ..utils.logger import setup_logger
+
+logger = setup_logger()
+
+@lru_cache(maxsize=None)
+def resolve_chromedriver_path():
+    configured_path = os.getenv("CHROMEDRIVER_PATH")
+    if configured_path:
+        return configured_path
+
+    try:
+        with open(CHROMEDRIVER_PATH_CACHE, 'r', encoding='utf-8') as f:
+            cached_path = f.read().strip()
+        if cached_path and os.access(cached_path, os.X_OK):
+            logger.debug(f"Using cached chromedriver: {cached_path}")
+            return cached_path
+    except OSError:
+        pass
 
-def setup_driver():
+    driver_path = ChromeDriverManager().install()
+    try:
+        os.makedirs(os.path.dirname(CHROMEDRIVER_PATH_CACHE), exist_ok=True)
+        with open(CHROMEDRIVER_PATH_CACHE, 'w', encoding='utf-8') as f:
+            f.write(driver_path)
+    except OSError as e:
+        logger.warning(f"Unable to cache chromedriver path: {str(e)}")
+    logger.info(f"Resolved chromedriver: {driver_path}")
+    return driver_path
+
+def forget_chromedriver_path():
+    resolve_chromedriver_path.cache_clear()
+    try:
+        os.remove(CHROMEDRIVER_PATH_CACHE)
+    except OSError:
+        pass
+
+def start_chrome(options):
+    try:
+        return webdriver.Chrome(service=ChromeService(resolve_chromedriver_path()), options=options)
+    except SessionNotCreatedException as e:
+        if os.getenv("CHROMEDRIVER_PATH"):
+            raise
+        # Usually a saved chromedriver left behind by a Chrome update, so it is resolved again once
+        logger.warning(f"Chromedriver could not start Chrome, resolving it again: {e.msg}")
+        forget_chromedriver_path()
+        return webdriver.Chrome(service=ChromeService(resolve_chromedriver_path()), options=options)
+
+def setup_driver(user_data_dir=None, lean=False, headless=None):
+    # The lean profile is for scraping with an already logged-in profile: the
+    # scraper only reads DOM text and src attributes, so images, fonts, media
+    # and trackers are never fetched and pages count as loaded at DOMContentLoaded
+    headless = lean if headless is None else headless
     options = webdriver.ChromeOptions()
     options.add_argument("--disable-gpu")
     options.add_argument("--window-size=1920,1080")
     options.add_argument("--disable-extensions")
     options.add_argument("--no-sandbox")
     options.add_argument("--disable-dev-shm-usage")
+    if user_data_dir:
+        options.add_argument(f"--user-data-dir={os.path.abspath(user_data_dir)}")
+    if headless:
+        options.add_argument("--headless=new")
+    if lean:
+        options.page_load_strategy = 'eager'
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        options.add_argument("--mute-audio")
+        options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.managed_default_content_settings.media_stream": 2,
+        })
     
     user_agents = [
         "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/87.0.4280.66 Safari/537.36",
@@ -20,8 +86,7 @@ def setup_driver():
     options.add_experimental_option("excludeSwitches", ["enable-automation"])
     options.add_experimental_option('useAutomationExtension', False)
     
-    service = ChromeService(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=options)
+    driver = start_chrome(options)
     
     driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {
         "source": """
@@ -30,5 +95,13 @@ def setup_driver():
             })
         """
     })
+
+    if lean:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": LEAN_BLOCKED_URLS})
+        logger.info(f"Lean browser started (headless: {headless}, {len(LEAN_BLOCKED_URLS)} blocked URL patterns)")
     
-    return driver
\ No newline at end of file
+    return driver
+
+def driver_factory(lean=False, headed=False):
+    return partial(setup_driver, lean=lean, headless=lean and not headed)
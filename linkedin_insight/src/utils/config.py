@@ -7,6 +7,69 @@ load_dotenv()
 LINKEDIN_USERNAME = os.getenv("LINKEDIN_USERNAME")
 LINKEDIN_PASSWORD = os.getenv("LINKEDIN_PASSWORD")
 
+LINKEDIN_INSIGHT_HOME = os.path.join(os.path.expanduser("~"), ".cache", "linkedin_insight")
+
+SNAPSHOTS_DIR = "snapshots"
+PROFILE_ARCHIVE_NAME = "profiles"
+SNAPSHOT_DB_PATH = os.getenv("LINKEDIN_INSIGHT_DB", "linkedin_insight.db")
+CACHE_MAX_AGE = 3 * 24 * 60 * 60
+
+IMAGE_DOWNLOAD_WORKERS = 8
+IMAGE_DOWNLOAD_PER_HOST = 4
+IMAGE_DOWNLOAD_RETRIES = 3
+IMAGE_DOWNLOAD_BACKOFF = 0.5
+IMAGE_DOWNLOAD_TIMEOUT = 10
+
+IMAGE_CACHE_DIR = os.getenv("LINKEDIN_INSIGHT_IMAGE_CACHE", os.path.join(LINKEDIN_INSIGHT_HOME, "images"))
+IMAGE_CACHE_MAX_BYTES = 1024 * 1024 * 1024
+IMAGE_CACHE_MAX_AGE = 7 * 24 * 60 * 60
+
+CHROMEDRIVER_PATH_CACHE = os.path.join(LINKEDIN_INSIGHT_HOME, "chromedriver_path")
+BROWSER_PROFILE_DIR = os.getenv("LINKEDIN_INSIGHT_BROWSER_PROFILES", os.path.join(LINKEDIN_INSIGHT_HOME, "browser_profiles"))
+DRIVER_POOL_SIZE = 1
+
+# Requests dropped by the lean browser profile (--lean): images, fonts, media
+# and analytics/ads endpoints, none of which the scraper reads
+LEAN_BLOCKED_URLS = [
+    "*.jpg", "*.jpeg", "*.png", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*.mp4", "*.webm", "*.m3u8", "*.mp3",
+    "*media.licdn.com/dms/image*",
+    "*px.ads.linkedin.com*", "*linkedin.com/li/track*",
+    "*doubleclick.net*", "*google-analytics.com*", "*googletagmanager.com*",
+    "*connect.facebook.net*", "*bat.bing.com*", "*analytics.tiktok.com*",
+]
+
+BATCH_MAX_ATTEMPTS = 3
+
+SCROLL_IDLE_TIMEOUT = 4
+SCROLL_POLL_INTERVAL = 0.25
+MAX_SCROLLS = 200
+MAX_EMPLOYEE_CARDS = 1000
+MAX_JOB_CARDS = 500
+EXTRACTION_MODE = "page-source"
+
+PROFILE_TTL_DAYS = 30
+PROFILE_TTL = PROFILE_TTL_DAYS * 24 * 60 * 60
+PROFILE_EXTRACTION_WORKERS = os.cpu_count() or 1
+JSON_WORKERS = os.cpu_count() or 1
+
+PYRAMID_FORMAT = "png"
+PYRAMID_AGGREGATE_THRESHOLD = 50
+
+HTML_PYRAMID_MODE = "auto"
+HTML_VIRTUAL_THRESHOLD = 500
+HTML_PAGE_SIZE = 60
+THUMBNAIL_SIZE = 120
+THUMBNAIL_WORKERS = 4
+
+TEMPLATE_CACHE_DIR = os.path.join(LINKEDIN_INSIGHT_HOME, "templates")
+
+SENIORITY_RULES_PATH = os.getenv("LINKEDIN_INSIGHT_SENIORITY_RULES")
+
+EXPORT_DIR = os.getenv("LINKEDIN_INSIGHT_EXPORT_DIR", "linkedin_insight_export")
+EXPORT_FORMAT = "auto"
+
 GENERIC_USER_IMAGE = '''
 <svg xmlns="http://www.w3.org/2000/svg" width="100" height="100" viewBox="0 0 100 100">
   <circle cx="50" cy="50" r="50" fill="#e0e0e0"/>
@@ -14,15 +77,20 @@ GENERIC_USER_IMAGE = '''
   <path d="M50 65 Q50 85 80 85 A40 40 0 0 1 20 85 Q50 85 50 65" fill="#bdbdbd"/>
 </svg>
 '''
+GENERIC_IMAGE_FILENAME = "generic.svg"
 
 class DelayConfig:
-    def __init__(self, enabled=True, login=(1, 2), navigation=(2, 4), profile=(1, 3)):
+    def __init__(self, enabled=True, login=(1, 2), navigation=(2, 4), profile=(1, 3), scroll=(0.5, 1.5), scroll_idle_timeout=SCROLL_IDLE_TIMEOUT):
         self.enabled = enabled
         self.login = login
         self.navigation = navigation
         self.profile = profile
+        self.scroll = scroll
+        self.scroll_idle_timeout = scroll_idle_timeout
 
-def get_delay_config():
+DEFAULT_DELAY_CONFIG = DelayConfig()
+
+def get_delay_config(argv=None):
     parser = argparse.ArgumentParser(description="LinkedIn Scraper Configuration")
     
     group = parser.add_mutually_exclusive_group()
@@ -32,13 +100,44 @@ def get_delay_config():
     parser.add_argument("--login-delay", type=float, nargs=2, metavar=('MIN', 'MAX'), default=[1, 2], help="Login delay (default: 1 2)")
     parser.add_argument("--navigation-delay", type=float, nargs=2, metavar=('MIN', 'MAX'), default=[2, 4], help="Navigation delay (default: 2 4)")
     parser.add_argument("--profile-delay", type=float, nargs=2, metavar=('MIN', 'MAX'), default=[1, 3], help="Profile delay (default: 1 3)")
+    parser.add_argument("--scroll-delay", type=float, nargs=2, metavar=('MIN', 'MAX'), default=[0.5, 1.5], help="Pause between scrolls of a list page (default: 0.5 1.5)")
+    parser.add_argument("--scroll-idle-timeout", type=float, default=SCROLL_IDLE_TIMEOUT, metavar='SECONDS', help=f"Stop scrolling a list after SECONDS without new cards (default: {SCROLL_IDLE_TIMEOUT})")
+    parser.add_argument("--extraction-mode", choices=['page-source', 'script'], default=EXTRACTION_MODE, help=f"Parse card fields from the downloaded page source, or collect them in the browser with one script per page; script mode does not save page snapshots (default: {EXTRACTION_MODE})")
+    parser.add_argument("--max-employees", type=int, default=MAX_EMPLOYEE_CARDS, help=f"Load and keep at most this many cards from the people list (default: {MAX_EMPLOYEE_CARDS})")
+    parser.add_argument("--max-jobs", type=int, default=MAX_JOB_CARDS, help=f"Load and keep at most this many cards from the jobs list (default: {MAX_JOB_CARDS})")
     
-    parser.add_argument("--json", type=str, help="Path to JSON file to generate CSV and hierarchy pyramid")
+    parser.add_argument("--json", type=str, nargs='+', metavar='PATH', help="JSON files, glob patterns or directories of snapshots to generate CSV and hierarchy pyramids from")
+    parser.add_argument("--workers", type=int, default=JSON_WORKERS, help=f"Processes used to reprocess JSON files (default: {JSON_WORKERS})")
+    parser.add_argument("--replay", type=str, metavar='DIR', help="Rebuild company data from saved page snapshots in DIR without a browser")
+    parser.add_argument("--batch", type=str, metavar='FILE', help="Scrape every company URL or name listed in FILE, one per line")
+    parser.add_argument("--batch-workers", type=int, help="Companies scraped concurrently in batch mode (default: --browsers)")
+    parser.add_argument("--batch-report", type=str, metavar='PATH', help="Where to write the batch run report (default: <FILE>_report.json)")
+    parser.add_argument("--timings", type=str, metavar='FILE', help="Write a JSON breakdown of the time spent in each stage to FILE")
     parser.add_argument("--create-pyramid", action='store_true', help="Create hierarchy pyramid (default: disabled)")
     parser.add_argument("--create-html-pyramid", action='store_true', help="Create HTML hierarchy pyramid (default: disabled)")
     parser.add_argument("--force", action='store_true', help="Force a new scan even if cache exists")
+    parser.add_argument("--export", action='store_true', help="Append employees, jobs and seniority levels to the columnar export dataset")
+    parser.add_argument("--export-format", choices=['auto', 'parquet', 'sqlite'], default=EXPORT_FORMAT, help=f"Columnar export format; auto uses Parquet when pyarrow is installed, SQLite otherwise (default: {EXPORT_FORMAT})")
+    parser.add_argument("--export-dir", type=str, default=EXPORT_DIR, help=f"Directory of the columnar export dataset (default: {EXPORT_DIR})")
+    parser.add_argument("--html-pyramid-mode", choices=['auto', 'full', 'virtual'], default=HTML_PYRAMID_MODE, help=f"HTML pyramid layout: every card inline, or cards rendered on demand from embedded data; auto picks virtual above {HTML_VIRTUAL_THRESHOLD} employees (default: {HTML_PYRAMID_MODE})")
+    parser.add_argument("--pyramid-format", choices=['png', 'svg'], default=PYRAMID_FORMAT, help=f"Output format of the hierarchy pyramid (default: {PYRAMID_FORMAT})")
+    parser.add_argument("--pyramid-threshold", type=int, default=PYRAMID_AGGREGATE_THRESHOLD, metavar='N', help=f"Collapse pyramid levels with more than N employees into one node, 0 to disable (default: {PYRAMID_AGGREGATE_THRESHOLD})")
+    parser.add_argument("--seniority-rules", type=str, default=SENIORITY_RULES_PATH, metavar='FILE', help="JSON file mapping pyramid levels to title keywords")
+    parser.add_argument("--browsers", type=int, default=DRIVER_POOL_SIZE, help=f"Number of warm browser instances to keep (default: {DRIVER_POOL_SIZE})")
+    parser.add_argument("--lean", action='store_true', help="Run Chrome headless with images, fonts, media and trackers blocked and an eager page-load strategy")
+    parser.add_argument("--headed", action='store_true', help="Keep the browser window visible in --lean mode, e.g. to solve a CAPTCHA")
+    parser.add_argument("--browser-profile-dir", type=str, default=BROWSER_PROFILE_DIR, help=f"Directory for persisted, logged-in browser profiles (default: {BROWSER_PROFILE_DIR})")
+    parser.add_argument("--pipeline", action='store_true', help="Download photos and write CSV/JSON Lines output while the browser is still navigating")
+    parser.add_argument("--incremental", action='store_true', help="Only visit profiles that changed since the previous snapshot")
+    parser.add_argument("--profile-ttl", type=float, default=PROFILE_TTL_DAYS, metavar='DAYS', help=f"Revisit unchanged profiles older than DAYS in incremental mode (default: {PROFILE_TTL_DAYS})")
+    parser.add_argument("--extract-profiles", action='store_true', help="Parse location, experience and education from the archived profile pages")
+    parser.add_argument("--profile-workers", type=int, default=PROFILE_EXTRACTION_WORKERS, help=f"Processes used to parse profile pages (default: {PROFILE_EXTRACTION_WORKERS})")
+    parser.add_argument("--download-workers", type=int, default=IMAGE_DOWNLOAD_WORKERS, help=f"Concurrent photo downloads (default: {IMAGE_DOWNLOAD_WORKERS})")
+    parser.add_argument("--per-host-downloads", type=int, default=IMAGE_DOWNLOAD_PER_HOST, help=f"Concurrent photo downloads per host (default: {IMAGE_DOWNLOAD_PER_HOST})")
+    parser.add_argument("--image-cache-dir", type=str, default=IMAGE_CACHE_DIR, help=f"Shared image cache directory (default: {IMAGE_CACHE_DIR})")
+    parser.add_argument("--no-image-cache", action='store_true', help="Download photos without the shared image cache")
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     enabled = not args.no_delay
     
@@ -46,7 +145,9 @@ def get_delay_config():
         enabled=enabled,
         login=tuple(args.login_delay),
         navigation=tuple(args.navigation_delay),
-        profile=tuple(args.profile_delay)
+        profile=tuple(args.profile_delay),
+        scroll=tuple(args.scroll_delay),
+        scroll_idle_timeout=args.scroll_idle_timeout
     )
 
 def parse_arguments():
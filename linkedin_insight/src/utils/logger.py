@@ -1,19 +1,140 @@
+import atexit
+import copy
+import json
 import logging
+import os
+import queue
+import threading
+import time
+from contextlib import ContextDecorator
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+
+LOG_FILE = 'linkedin_scraper.log'
+
+# Callers only put records on a queue; a listener thread formats them and
+# writes the JSON lines log file and the console, off the scraping threads.
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'thread': record.threadName,
+            'message': record.getMessage()
+        }
+        if getattr(record, 'span', None):
+            entry['span'] = record.span
+            entry['duration'] = record.duration
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+class RecordQueueHandler(QueueHandler):
+    # The listener runs in this process, so records keep their exc_info for
+    # JsonFormatter instead of having the traceback folded into the message
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
 
 def setup_logger():
     logger = logging.getLogger(__name__)
     if not logger.handlers:
-        handler = logging.FileHandler('linkedin_scraper.log')
+        handler = logging.FileHandler(LOG_FILE)
         handler.setLevel(logging.INFO)
-        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-        handler.setFormatter(formatter)
-        logger.addHandler(handler)
-        
+        handler.setFormatter(JsonFormatter())
+
         console_handler = logging.StreamHandler()
         console_handler.setLevel(logging.DEBUG)
-        console_handler.setFormatter(formatter)
-        logger.addHandler(console_handler)
-        
+        console_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+
+        log_queue = queue.SimpleQueue()
+        listener = QueueListener(log_queue, handler, console_handler, respect_handler_level=True)
+        listener.start()
+        atexit.register(listener.stop)
+        logger.addHandler(RecordQueueHandler(log_queue))
+        if hasattr(os, 'register_at_fork'):
+            # Forked worker processes have no listener thread, so they write directly
+            os.register_at_fork(after_in_child=lambda: use_handlers(logger, [handler, console_handler]))
+
         logger.setLevel(logging.DEBUG)
-    
-    return logger
\ No newline at end of file
+
+    return logger
+
+def use_handlers(logger, handlers):
+    for existing in list(logger.handlers):
+        logger.removeHandler(existing)
+    for handler in handlers:
+        logger.addHandler(handler)
+
+class SpanRecorder:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started = time.perf_counter()
+        self.started_at = datetime.now().isoformat(timespec='seconds')
+        self.spans = []
+
+    def record(self, name, start, duration, failed):
+        with self.lock:
+            self.spans.append({
+                'span': name,
+                'start': round(start - self.started, 6),
+                'duration': round(duration, 6),
+                'thread': threading.current_thread().name,
+                'failed': failed
+            })
+
+    def summary(self):
+        with self.lock:
+            spans = list(self.spans)
+        totals = {}
+        for entry in spans:
+            total = totals.setdefault(entry['span'], {'count': 0, 'total': 0.0, 'max': 0.0, 'failed': 0})
+            total['count'] += 1
+            total['total'] += entry['duration']
+            total['max'] = max(total['max'], entry['duration'])
+            total['failed'] += entry['failed']
+        for total in totals.values():
+            total['total'] = round(total['total'], 6)
+            total['mean'] = round(total['total'] / total['count'], 6)
+        return totals
+
+    def report(self):
+        with self.lock:
+            spans = list(self.spans)
+        return {
+            'started_at': self.started_at,
+            'elapsed': round(time.perf_counter() - self.started, 6),
+            'summary': self.summary(),
+            'spans': spans
+        }
+
+    def write_report(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, ensure_ascii=False, indent=4)
+
+span_recorder = SpanRecorder()
+
+# Times a block or a function as a named stage, `with span('parse.people'):` or
+# `@span('login')`. Every span is logged and kept by span_recorder, which can
+# write the per-run breakdown as JSON.
+class span(ContextDecorator):
+    def __init__(self, name):
+        self.name = name
+        self.start = None
+
+    def _recreate_cm(self):
+        # A decorated function gets a fresh span per call, so threads don't share timers
+        return span(self.name)
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = time.perf_counter() - self.start
+        span_recorder.record(self.name, self.start, duration, exc_type is not None)
+        setup_logger().info(f"{self.name} took {duration:.3f}s", extra={'span': self.name, 'duration': round(duration, 6)})
+        return False
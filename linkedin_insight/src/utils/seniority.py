@@ -0,0 +1,71 @@
+import json
+import re
+from functools import lru_cache
+from .config import SENIORITY_RULES_PATH
+from .logger import setup_logger
+
+logger = setup_logger()
+
+# Seniority levels shared by the Graphviz and HTML pyramids. Keywords are
+# matched as whole words, case-insensitively; when a title contains several,
+# the most senior level wins ("Senior Manager" is level 4). Titles without
+# any keyword land on UNKNOWN_LEVEL, below every rule.
+DEFAULT_RULES = {
+    1: ['ceo', 'chief executive officer', 'chief executive', 'founder', 'co-founder', 'president'],
+    2: ['cto', 'cfo', 'coo', 'vice president'],
+    3: ['director'],
+    4: ['manager', 'team lead', 'head of'],
+    5: ['senior'],
+    6: ['junior', 'associate'],
+    7: ['intern']
+}
+UNKNOWN_LEVEL = 8
+TITLE_CACHE_SIZE = 65536
+SEPARATORS = re.compile(r'[\s-]+')
+
+def load_rules(path):
+    # Rules files map a level to its keywords: {"1": ["ceo", "founder"], "2": [...]}
+    with open(path, 'r', encoding='utf-8') as f:
+        rules = json.load(f)
+    return {int(level): [str(keyword) for keyword in keywords] for level, keywords in rules.items()}
+
+def normalize_keyword(keyword):
+    # "Vice-President", "vice  president" and "Vice President" are the same keyword
+    return ' '.join(SEPARATORS.split(keyword.lower())).strip()
+
+@lru_cache(maxsize=None)
+def get_classifier(rules_path=None):
+    rules_path = rules_path or SENIORITY_RULES_PATH
+    if not rules_path:
+        return default_classifier
+    logger.info(f"Loading seniority rules from {rules_path}")
+    return SeniorityClassifier(load_rules(rules_path))
+
+class SeniorityClassifier:
+    def __init__(self, rules=DEFAULT_RULES):
+        self.levels = {}
+        for level, keywords in rules.items():
+            for keyword in keywords:
+                keyword = normalize_keyword(keyword)
+                if keyword:
+                    self.levels[keyword] = min(level, self.levels.get(keyword, level))
+        self.unknown_level = max(max(self.levels.values(), default=0) + 1, UNKNOWN_LEVEL)
+
+        # One alternation for every keyword, longest first, so "vice president"
+        # is consumed as a whole before "president" can match inside it
+        keywords = sorted(self.levels, key=lambda k: (-len(k), k))
+        alternation = '|'.join(r'[\s-]+'.join(re.escape(word) for word in k.split()) for k in keywords)
+        self.pattern = re.compile(rf"(?<!\w)(?:{alternation})(?!\w)", re.IGNORECASE) if keywords else None
+        self.classify = lru_cache(maxsize=TITLE_CACHE_SIZE)(self._classify)
+
+    def _classify(self, title):
+        if not title or self.pattern is None:
+            return self.unknown_level
+        levels = self.levels
+        return min((levels[normalize_keyword(match)] for match in self.pattern.findall(title)), default=self.unknown_level)
+
+    def classify_titles(self, titles):
+        classify = self.classify
+        return [classify(title or '') for title in titles]
+
+default_classifier = SeniorityClassifier()
@@ -1,57 +1,96 @@
+import os
+import hashlib
 import graphviz
 import subprocess
-from ..utils.logger import setup_logger
+from collections import Counter
+from functools import lru_cache
+from ..utils.logger import setup_logger, span
+from ..utils.config import PYRAMID_FORMAT, PYRAMID_AGGREGATE_THRESHOLD
+from ..utils.seniority import default_classifier
 
 logger = setup_logger()
 
-def create_hierarchy_pyramid(employees, company_name, output_dir):
+AGGREGATE_TOP_TITLES = 3
+
+@lru_cache(maxsize=None)
+def graphviz_available():
     try:
         subprocess.run(['dot', '-V'], stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
+        return True
     except (subprocess.CalledProcessError, FileNotFoundError):
+        return False
+
+@span('render.graphviz')
+def create_hierarchy_pyramid(employees, company_name, output_dir, classifier=default_classifier,
+                             output_format=PYRAMID_FORMAT, aggregate_threshold=PYRAMID_AGGREGATE_THRESHOLD):
+    if not graphviz_available():
         logger.critical("Graphviz is not installed or the 'dot' executable is not in PATH. Hierarchy pyramid will not be created.")
         return
 
-    hierarchy_mapping = {
-        'CEO': 1, 'Chief Executive Officer': 1, 'Founder': 1, 'President': 1,
-        'CTO': 2, 'CFO': 2, 'COO': 2, 'Vice President': 2,
-        'Director': 3,
-        'Manager': 4, 'Team Lead': 4,
-        'Senior': 5,
-        'Junior': 6, 'Associate': 6,
-        'Intern': 7
-    }
-
-    for employee in employees:
-        title = employee.get('title', '').lower()
-        employee['hierarchy_level'] = 999
-        for key in hierarchy_mapping:
-            if key.lower() in title:
-                employee['hierarchy_level'] = hierarchy_mapping[key]
-                break
-
-    employees_sorted = sorted(employees, key=lambda x: x.get('hierarchy_level', 999))
-
-    dot = graphviz.Digraph(comment='Hierarchy Pyramid')
+    # Only the fields drawn in the graph are kept, so employees can be a lazy stream
+    people = [(employee.get('name') or f"Employee {idx+1}", employee.get('title') or '') for idx, employee in enumerate(employees)]
+    levels = classifier.classify_titles(title for _, title in people)
+    levels_people = {}
+    for level, (name, title) in zip(levels, people):
+        levels_people.setdefault(level, []).append((name, title or 'Unknown'))
 
-    for idx, employee in enumerate(employees_sorted):
-        name = employee.get('name', f"Employee {idx+1}")
-        title = employee.get('title', 'Unknown')
-        dot.node(str(idx), f"{name}\n{title}")
-
-    previous_level_nodes = {}
-    for idx, employee in enumerate(employees_sorted):
-        level = employee.get('hierarchy_level', 999)
-        if level > 1:
-            for sup_level in range(level-1, 0, -1):
-                if sup_level in previous_level_nodes:
-                    sup_node = previous_level_nodes[sup_level]
-                    dot.edge(sup_node, str(idx))
-                    break
-        previous_level_nodes[level] = str(idx)
+    dot = build_pyramid_graph(levels_people, aggregate_threshold)
 
     pyramid_filepath = os.path.join(output_dir, f"{company_name}_hierarchy_pyramid")
+    output_filepath = f"{pyramid_filepath}.{output_format}"
+    hash_filepath = f"{pyramid_filepath}.dot.sha256"
+    source_hash = hashlib.sha256(f"{output_format}\n{dot.source}".encode('utf-8')).hexdigest()
+    if os.path.isfile(output_filepath) and read_hash(hash_filepath) == source_hash:
+        # Touched so --json sees the image as newer than the data file it was checked against
+        os.utime(output_filepath)
+        logger.info(f"Hierarchy pyramid unchanged, keeping {output_filepath}")
+        return output_filepath
+
     try:
-        dot.render(pyramid_filepath, format='png', cleanup=True)
-        logger.info(f"Hierarchy pyramid created: {pyramid_filepath}.png")
+        dot.render(pyramid_filepath, format=output_format, cleanup=True)
+        with open(hash_filepath, 'w', encoding='utf-8') as f:
+            f.write(source_hash)
+        logger.info(f"Hierarchy pyramid created: {output_filepath}")
+        return output_filepath
     except Exception as e:
-        logger.error(f"Error creating hierarchy pyramid: {str(e)}")
\ No newline at end of file
+        logger.error(f"Error creating hierarchy pyramid: {str(e)}")
+
+def build_pyramid_graph(levels_people, aggregate_threshold=PYRAMID_AGGREGATE_THRESHOLD):
+    # Each level is a rank=same subgraph, so dot lays the pyramid out row by
+    # row. Levels with more than aggregate_threshold people collapse into one
+    # node with a head count and the most common titles (0 disables this).
+    dot = graphviz.Digraph(comment='Hierarchy Pyramid')
+    dot.attr(rankdir='TB', ranksep='1.0')
+    dot.attr('node', shape='box', style='rounded')
+
+    previous_level_node = None
+    for level in sorted(levels_people):
+        members = sorted(levels_people[level])
+        level_nodes = []
+        with dot.subgraph(name=f"level_{level}") as subgraph:
+            subgraph.attr(rank='same')
+            if aggregate_threshold and len(members) > aggregate_threshold:
+                node_id = f"level_{level}_all"
+                top_titles = Counter(title for _, title in members).most_common(AGGREGATE_TOP_TITLES)
+                label = f"Level {level}: {len(members)} employees\n" + '\n'.join(f"{title} ({count})" for title, count in top_titles)
+                subgraph.node(node_id, label, shape='folder')
+                level_nodes.append(node_id)
+            else:
+                for idx, (name, title) in enumerate(members):
+                    node_id = f"level_{level}_{idx}"
+                    subgraph.node(node_id, f"{name}\n{title}")
+                    level_nodes.append(node_id)
+
+        # Every node hangs off the last node of the nearest level above it
+        if previous_level_node:
+            for node_id in level_nodes:
+                dot.edge(previous_level_node, node_id)
+        previous_level_node = level_nodes[-1]
+    return dot
+
+def read_hash(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read().strip()
+    except OSError:
+        return None
@@ -0,0 +1,45 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from ..utils.config import THUMBNAIL_SIZE, THUMBNAIL_WORKERS
+from ..utils.logger import setup_logger
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    Image = None
+
+logger = setup_logger()
+
+# Small square thumbnails for the virtual HTML pyramid, generated from the
+# photos already downloaded into images/. Pillow is optional: without it the
+# page falls back to the downloaded photos themselves.
+
+def create_thumbnails(photo_filepaths, thumbnails_dir, size=THUMBNAIL_SIZE, max_workers=THUMBNAIL_WORKERS):
+    if Image is None:
+        logger.info("Pillow is not installed, using full-size photos in the HTML pyramid.")
+        return list(photo_filepaths)
+
+    if not os.path.exists(thumbnails_dir):
+        os.makedirs(thumbnails_dir)
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        return list(executor.map(lambda path: create_thumbnail(path, thumbnails_dir, size), photo_filepaths))
+
+def create_thumbnail(photo_filepath, thumbnails_dir, size=THUMBNAIL_SIZE):
+    if not photo_filepath:
+        return None
+    thumbnail_filepath = os.path.join(thumbnails_dir, os.path.basename(photo_filepath))
+    try:
+        # Thumbnails newer than their photo are reused across runs
+        if os.path.getmtime(thumbnail_filepath) >= os.path.getmtime(photo_filepath):
+            return thumbnail_filepath
+    except OSError:
+        pass
+
+    try:
+        with Image.open(photo_filepath) as image:
+            thumbnail = ImageOps.fit(image.convert('RGB'), (size, size))
+            thumbnail.save(thumbnail_filepath, 'JPEG', quality=80, optimize=True)
+        return thumbnail_filepath
+    except Exception as e:
+        logger.warning(f"Unable to create thumbnail for {photo_filepath}: {str(e)}")
+        return photo_filepath